@@ -17,7 +17,16 @@ def create_app(config_name='default'):
     # Initialize extensions
     db.init_app(app)
     CORS(app)
-    JWTManager(app)
+    jwt = JWTManager(app)
+    
+    # Reject tokens issued before a password or role change on every route
+    from utils.auth_utils import token_revoked, revoked_token_response
+    jwt.token_in_blocklist_loader(token_revoked)
+    jwt.revoked_token_loader(revoked_token_response)
+    
+    # JSON responses through orjson when available
+    from utils.json_provider import init_json
+    init_json(app, app.config['JSON_ENCODER'])
     
     # Swagger configuration
     swagger_config = {
@@ -74,6 +83,71 @@ def create_app(config_name='default'):
     app.register_blueprint(mock_auth_bp)  # Mock auth for testing without DB
     app.register_blueprint(organizer_bp)  # Organizer routes
     
+    # Ticket token signing and QR rendering worker pool
+    from utils import qr_generator, ticket_tokens, gate_bundle
+    ticket_tokens.configure(app.config['TICKET_SIGNING_KEY'])
+    gate_bundle.configure(app.config['BUNDLE_SIGNING_KEY'])
+    qr_generator.configure(
+        app.config['QR_RENDER_WORKERS'],
+        app.config['QR_RENDER_QUEUE_SIZE'],
+        app.config['QR_CACHE_SIZE'],
+        app.config['QR_CACHE_TTL']
+    )
+    
+    # Public event response cache
+    from utils import response_cache
+    response_cache.configure(
+        app.config['RESPONSE_CACHE_BACKEND'],
+        ttl=app.config['RESPONSE_CACHE_TTL'],
+        maxsize=app.config['RESPONSE_CACHE_SIZE'],
+        redis_url=app.config['REDIS_URL']
+    )
+    
+    # Rate limits for login, purchase and ticket validation
+    from utils import rate_limit
+    rate_limit.configure(
+        app.config['RATE_LIMIT_BACKEND'],
+        limits={
+            'login': app.config['RATE_LIMIT_LOGIN'],
+            'purchase': app.config['RATE_LIMIT_PURCHASE'],
+            'validate': app.config['RATE_LIMIT_VALIDATE']
+        },
+        redis_url=app.config['REDIS_URL']
+    )
+    
+    # Password hashing method and worker pool
+    from utils import passwords
+    passwords.configure(
+        app.config['PASSWORD_HASH_METHOD'],
+        app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_QUEUE_SIZE']
+    )
+    
+    # Per-process caches of resolved users and their token versions
+    from utils import users
+    users.configure(
+        app.config['USER_CACHE_SIZE'],
+        ttl=app.config['USER_CACHE_TTL'],
+        version_ttl=app.config['TOKEN_VERSION_CACHE_TTL']
+    )
+    
+    # ETag version counters and sales counters kept in sync with event writes
+    from utils.versions import init_versions
+    from utils.sales_counters import init_sales_counters
+    init_versions()
+    init_sales_counters()
+    
+    # Event search backend
+    from utils.search import init_search
+    from utils.suggest import init_suggest
+    init_search(app.config['SEARCH_BACKEND'], app.config['SEARCH_REFRESH_INTERVAL'])
+    init_suggest(app.config['SEARCH_REFRESH_INTERVAL'])
+    
+    # Return expired checkout holds to inventory
+    if app.config.get('RESERVATION_SWEEP_INTERVAL'):
+        from utils.reservations import start_sweeper
+        start_sweeper(app.config['RESERVATION_SWEEP_INTERVAL'])
+    
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
     def health_check():
@@ -99,6 +173,32 @@ def create_app(config_name='default'):
             'message': 'Bilet App API is running'
         }), 200
     
+    # Cache metrics endpoint
+    @app.route('/api/metrics/cache', methods=['GET'])
+    def cache_metrics():
+        """Response cache hit-rate metrics
+        ---
+        tags:
+          - System
+        responses:
+          200:
+            description: Response cache statistics
+            schema:
+              type: object
+              properties:
+                backend:
+                  type: string
+                hits:
+                  type: integer
+                misses:
+                  type: integer
+                hitRate:
+                  type: number
+                size:
+                  type: integer
+        """
+        return jsonify(response_cache.cache.stats()), 200
+    
     # Root endpoint
     @app.route('/', methods=['GET'])
     def index():
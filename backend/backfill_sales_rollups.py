@@ -0,0 +1,31 @@
+"""
+Build the hourly sales rollups from existing tickets
+Run with: python backfill_sales_rollups.py
+
+Groups every non-pending ticket by event and purchase hour and writes the
+sold/revenue figures of the matching sales_buckets documents. New sales
+and cancellations keep the buckets current from then on, so run it once
+when rollups are introduced: tickets cancelled before the backfill cannot
+be recovered, and a later re-run would drop cancelled tickets from `sold`.
+"""
+from mongoengine import connect
+import certifi
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connect to MongoDB
+mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/bilet_app')
+print(f"🔗 Connecting to MongoDB...")
+connect(host=mongodb_uri, tlsCAFile=certifi.where())
+print(f"✅ Connected!")
+
+# Import after connection
+from models import SalesBucket
+from utils.sales_rollup import backfill
+
+SalesBucket.ensure_indexes()
+written = backfill()
+
+print(f"\n🎉 Done! Wrote {written} hourly sales buckets.")
@@ -0,0 +1,177 @@
+"""
+Attendee listing query-count regression check
+Run with: python benchmark_attendees.py
+
+Loads one event with BENCH_ATTENDEES tickets (10k by default), each held by
+a different user, and counts the MongoDB commands issued by the legacy
+per-ticket dereference loop and by the paginated attendee listing. Exits
+non-zero if a page of attendees needs more than MAX_QUERIES_PER_PAGE
+commands. Point BENCH_MONGODB_URI at a local mongod; the benchmark
+database is dropped afterwards.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import monitoring
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+ATTENDEES = int(os.getenv('BENCH_ATTENDEES', 10_000))
+PER_PAGE = 100
+MAX_QUERIES_PER_PAGE = 3  # tickets page, batched users, total count
+BATCH_SIZE = 10_000
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+connect(host=MONGODB_URI, event_listeners=[counter])
+
+from flask import Flask
+from models import Event, Ticket, User
+from utils.attendees import event_tickets, attendee_rows
+from utils.pagination import paginate
+
+app = Flask(__name__)
+
+
+def load_data():
+    """Bulk insert one event, its attendees and their tickets"""
+    now = datetime.utcnow()
+    event_id = ObjectId()
+    Event._get_collection().insert_one({
+        '_id': event_id,
+        'title': 'Attendee Benchmark',
+        'description': 'Attendee benchmark event',
+        'category': 'Music',
+        'location': 'Benchmark Arena',
+        'date': now + timedelta(days=30),
+        'price': 50.0,
+        'image_url': 'https://picsum.photos/800/450',
+        'available_tickets': 0,
+        'organizer_name': 'Bench',
+        'created_at': now
+    })
+
+    for offset in range(0, ATTENDEES, BATCH_SIZE):
+        users = [
+            {
+                '_id': ObjectId(),
+                'email': f'attendee{i}@bench.test',
+                'password_hash': 'x',
+                'name': f'Attendee {i}',
+                'phone': '+900000000000',
+                'role': 'user',
+                'created_at': now
+            }
+            for i in range(offset, min(ATTENDEES, offset + BATCH_SIZE))
+        ]
+        User._get_collection().insert_many(users, ordered=False)
+        Ticket._get_collection().insert_many([
+            {
+                '_id': ObjectId(),
+                'event_id': event_id,
+                'user_id': user['_id'],
+                'event_title': 'Attendee Benchmark',
+                'event_location': 'Benchmark Arena',
+                'event_date': now + timedelta(days=30),
+                'status': 'active',
+                'purchase_date': now - timedelta(seconds=i),
+                'price': 50.0,
+                'qr_code': f'bench-{user["_id"]}'
+            }
+            for i, user in enumerate(users, start=offset)
+        ], ordered=False)
+    return event_id
+
+
+def legacy_attendees(event_id):
+    """The previous implementation: three dereferences per ticket"""
+    return [
+        {
+            'ticketId': str(ticket.id),
+            'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
+            'userEmail': ticket.user_id.email if ticket.user_id else 'Unknown',
+            'userPhone': ticket.user_id.phone if ticket.user_id else None,
+            'status': ticket.status,
+            'purchaseDate': ticket.purchase_date.isoformat() if ticket.purchase_date else None,
+            'qrCode': ticket.qr_code
+        }
+        for ticket in Ticket.objects(event_id=event_id).order_by('-purchase_date')
+    ]
+
+
+def paged_attendees(event_id, cursor=None):
+    """One page through the current implementation, returning (rows, next cursor)"""
+    query = f'per_page={PER_PAGE}' + (f'&cursor={cursor}' if cursor else '')
+    with app.test_request_context(f'/attendees?{query}'):
+        tickets = event_tickets(event_id)
+        page, meta = paginate(tickets, 'purchase_date', descending=True)
+        rows = attendee_rows(page)
+        tickets.count()
+    return rows, meta['next_cursor']
+
+
+def measure(fn, *args):
+    """Return (result, commands issued, elapsed ms)"""
+    counter.count = 0
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, counter.count, (time.perf_counter() - started) * 1000
+
+
+def run_benchmark():
+    """Compare command counts and latency of both implementations"""
+    for model in (Event, Ticket, User):
+        model.drop_collection()
+        model.ensure_indexes()
+    event_id = load_data()
+
+    legacy, legacy_queries, legacy_ms = measure(legacy_attendees, event_id)
+    (rows, cursor), page_queries, page_ms = measure(paged_attendees, event_id)
+    (_, _), deep_queries, _ = measure(paged_attendees, event_id, cursor)
+
+    print(f"\n{'='*60}")
+    print(f"Attendee listing for {ATTENDEES} attendees")
+    print(f"{'='*60}")
+    print(f"legacy, all attendees:     {legacy_queries:>7} commands {legacy_ms:>10.1f} ms")
+    print(f"paged, first {PER_PAGE}:         {page_queries:>7} commands {page_ms:>10.1f} ms")
+    print(f"paged, second {PER_PAGE}:        {deep_queries:>7} commands")
+
+    assert len(legacy) == ATTENDEES and len(rows) == PER_PAGE
+    assert rows[0]['userName'] == legacy[0]['userName']
+    if max(page_queries, deep_queries) > MAX_QUERIES_PER_PAGE:
+        print(f"❌ A page took more than {MAX_QUERIES_PER_PAGE} commands: N+1 regression")
+        return False
+    print("✅ Query count is independent of page size")
+    return True
+
+
+if __name__ == '__main__':
+    ok = False
+    try:
+        ok = run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,88 @@
+"""
+Offline validation bundle benchmark
+Run with: python benchmark_bundle.py
+
+Loads BENCH_TICKETS active tickets (50k by default) for one event and
+reports how long building the signed validation bundle takes and how large
+it is on the wire. Point BENCH_MONGODB_URI at a local mongod; the benchmark
+database is dropped afterwards.
+"""
+import os
+import json
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+TICKETS = int(os.getenv('BENCH_TICKETS', 50_000))
+RUNS = int(os.getenv('BENCH_RUNS', 5))
+BATCH_SIZE = 10_000
+
+connect(host=MONGODB_URI)
+
+from models import Ticket
+from utils.ticket_tokens import issue_token, qr_digest
+from utils.gate_bundle import build_bundle
+
+
+def load_tickets(event_id):
+    """Bulk insert synthetic active tickets for one event"""
+    collection = Ticket._get_collection()
+    user_id = ObjectId()
+    event_date = datetime.utcnow() + timedelta(days=30)
+
+    for offset in range(0, TICKETS, BATCH_SIZE):
+        docs = []
+        for _ in range(min(BATCH_SIZE, TICKETS - offset)):
+            ticket_id = ObjectId()
+            token = issue_token(ticket_id, event_id)
+            docs.append({
+                '_id': ticket_id,
+                'event_id': event_id,
+                'user_id': user_id,
+                'event_title': 'Benchmark Concert',
+                'event_location': 'Benchmark Arena',
+                'event_date': event_date,
+                'status': 'active',
+                'purchase_date': datetime.utcnow(),
+                'price': 50.0,
+                'qr_code': token,
+                'qr_digest': qr_digest(token)
+            })
+        collection.insert_many(docs, ordered=False)
+
+
+def run_benchmark():
+    """Time bundle generation and measure its size"""
+    Ticket.drop_collection()
+    Ticket.ensure_indexes()
+    event_id = ObjectId()
+    load_tickets(event_id)
+
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        bundle = build_bundle(event_id)
+        body = json.dumps(bundle)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"\n{'='*50}")
+    print(f"Validation bundle at {TICKETS} tickets")
+    print(f"{'='*50}")
+    print(f"Digests in bundle: {bundle['count']}")
+    print(f"Build time:        best {min(timings):.1f} ms, mean {sum(timings) / len(timings):.1f} ms")
+    print(f"Bundle size:       {len(body) / 1024:.1f} KiB JSON "
+          f"({bundle['count'] * bundle['digestBytes'] / 1024:.1f} KiB raw digests)")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
@@ -0,0 +1,128 @@
+"""
+Attendee export memory benchmark
+Run with: python benchmark_export.py
+
+Loads one event with BENCH_ATTENDEES tickets (100k by default), each held
+by a different user, and compares the peak Python heap of building the
+whole attendee list in memory with streaming the CSV and NDJSON exports.
+Point BENCH_MONGODB_URI at a local mongod; the benchmark database is
+dropped afterwards.
+"""
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from bson import ObjectId
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+ATTENDEES = int(os.getenv('BENCH_ATTENDEES', 100_000))
+BATCH_SIZE = 10_000
+
+connect(host=MONGODB_URI)
+
+from models import Event, Ticket, User
+from utils.attendees import event_tickets, attendee_rows, iter_attendees, csv_chunks, ndjson_chunks
+
+
+def load_data():
+    """Bulk insert one event, its attendees and their tickets"""
+    now = datetime.utcnow()
+    event_id = ObjectId()
+    Event._get_collection().insert_one({
+        '_id': event_id,
+        'title': 'Export Benchmark',
+        'description': 'Export benchmark event',
+        'category': 'Music',
+        'location': 'Benchmark Arena',
+        'date': now + timedelta(days=30),
+        'price': 50.0,
+        'image_url': 'https://picsum.photos/800/450',
+        'available_tickets': 0,
+        'organizer_name': 'Bench',
+        'created_at': now
+    })
+
+    for offset in range(0, ATTENDEES, BATCH_SIZE):
+        users = [
+            {
+                '_id': ObjectId(),
+                'email': f'attendee{i}@bench.test',
+                'password_hash': 'x',
+                'name': f'Attendee {i}',
+                'phone': '+900000000000',
+                'role': 'user',
+                'created_at': now
+            }
+            for i in range(offset, min(ATTENDEES, offset + BATCH_SIZE))
+        ]
+        User._get_collection().insert_many(users, ordered=False)
+        Ticket._get_collection().insert_many([
+            {
+                '_id': ObjectId(),
+                'event_id': event_id,
+                'user_id': user['_id'],
+                'event_title': 'Export Benchmark',
+                'event_location': 'Benchmark Arena',
+                'event_date': now + timedelta(days=30),
+                'status': 'active',
+                'purchase_date': now - timedelta(seconds=i),
+                'price': 50.0,
+                'qr_code': f'bench-{user["_id"]}'
+            }
+            for i, user in enumerate(users, start=offset)
+        ], ordered=False)
+    return event_id
+
+
+def in_memory(event_id):
+    """Build every row, then serialize the whole list at once"""
+    rows = attendee_rows(list(event_tickets(event_id).order_by('-purchase_date')))
+    return len(json.dumps({'attendees': rows, 'total': len(rows)}))
+
+
+def streamed(encode):
+    def run(event_id):
+        return sum(len(chunk) for chunk in encode(iter_attendees(event_id)))
+    return run
+
+
+def measure(fn, event_id):
+    """Return (peak traced heap in MB, elapsed seconds, bytes produced)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    produced = fn(event_id)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed, produced
+
+
+def run_benchmark():
+    """Compare peak memory of the three strategies"""
+    for model in (Event, Ticket, User):
+        model.drop_collection()
+        model.ensure_indexes()
+    event_id = load_data()
+
+    print(f"\n{'='*60}")
+    print(f"Attendee export of {ATTENDEES} attendees")
+    print(f"{'='*60}")
+    for label, fn in (('in-memory JSON', in_memory),
+                      ('streamed CSV', streamed(csv_chunks)),
+                      ('streamed NDJSON', streamed(ndjson_chunks))):
+        peak, elapsed, produced = measure(fn, event_id)
+        print(f"{label:<18}{peak:>9.1f} MB peak {elapsed:>8.2f} s {produced / 1024 / 1024:>8.1f} MB out")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
@@ -0,0 +1,76 @@
+"""
+Login password verification throughput benchmark
+Run with: python benchmark_login.py
+
+Measures password verifications per second, the CPU-bound part of a
+login, for each hash method in BENCH_HASH_METHODS: first inline on one
+core, then through utils.passwords' worker pool with BENCH_CLIENTS
+concurrent logins. Also checks that a hash made with another method is
+flagged for rehash. No database is needed.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from utils import passwords
+
+METHODS = os.getenv(
+    'BENCH_HASH_METHODS',
+    'scrypt,scrypt:16384:8:1,pbkdf2:sha256:600000,pbkdf2:sha256:260000'
+).split(',')
+WORKERS = int(os.getenv('BENCH_HASH_WORKERS', os.cpu_count() or 2))
+CLIENTS = int(os.getenv('BENCH_CLIENTS', 32))
+LOGINS = int(os.getenv('BENCH_LOGINS', 64))
+PASSWORD = 'CorrectHorseBattery9'
+
+
+def inline_rate(password_hash):
+    """Verifications per second on the calling thread"""
+    started = time.perf_counter()
+    for _ in range(LOGINS):
+        assert check_password_hash(password_hash, PASSWORD)
+    return LOGINS / (time.perf_counter() - started)
+
+
+def pooled_rate(password_hash):
+    """Verifications per second with CLIENTS threads sharing the pool"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+        results = list(clients.map(
+            lambda _: passwords.verify_password(password_hash, PASSWORD), range(LOGINS)
+        ))
+    assert all(results)
+    return LOGINS / (time.perf_counter() - started)
+
+
+def run_benchmark():
+    """Report inline and pooled verification rates per hash method"""
+    print(f"\n{'='*72}")
+    print(f"{LOGINS} logins per method, pool of {WORKERS} workers, {CLIENTS} concurrent clients")
+    print(f"{'='*72}")
+    print(f"{'method':<26}{'ms/verify':>12}{'logins/s/core':>16}{'pooled logins/s':>18}")
+
+    ok = True
+    for method in METHODS:
+        passwords.configure(method, workers=WORKERS, queue_size=CLIENTS)
+        password_hash = generate_password_hash(PASSWORD, method)
+        inline = inline_rate(password_hash)
+        pooled = pooled_rate(password_hash)
+        print(f"{passwords.method_prefix():<26}{1000 / inline:>12.1f}{inline:>16.1f}{pooled:>18.1f}")
+
+        if passwords.needs_rehash(password_hash):
+            print(f"❌ A fresh {method} hash was flagged for rehash")
+            ok = False
+        other = 'pbkdf2' if method.startswith('scrypt') else 'scrypt'
+        if not passwords.needs_rehash(generate_password_hash(PASSWORD, other)):
+            print(f"❌ A {other} hash was not flagged for rehash under {method}")
+            ok = False
+
+    if ok:
+        print("✅ Rehash detection matches the configured method")
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_benchmark() else 1)
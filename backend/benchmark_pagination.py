@@ -0,0 +1,93 @@
+"""
+Deep pagination benchmark: skip/limit vs keyset cursors
+Run with: python benchmark_pagination.py
+
+Loads enough events for BENCH_DEEP_PAGE pages (page 5,000 by default) and
+compares page 1 and the deep page fetched with skip/limit against the same
+pages fetched with a cursor. Point BENCH_MONGODB_URI at a local mongod; the
+benchmark database is dropped afterwards.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+PER_PAGE = int(os.getenv('BENCH_PER_PAGE', 20))
+DEEP_PAGE = int(os.getenv('BENCH_DEEP_PAGE', 5000))
+RUNS = int(os.getenv('BENCH_RUNS', 20))
+BATCH_SIZE = 10_000
+
+connect(host=MONGODB_URI)
+
+from flask import Flask
+from models import Event
+from utils.pagination import paginate, encode_cursor
+
+app = Flask(__name__)
+
+
+def load_events(count):
+    """Bulk insert synthetic events with distinct dates"""
+    collection = Event._get_collection()
+    start = datetime.utcnow()
+    for offset in range(0, count, BATCH_SIZE):
+        collection.insert_many([
+            {
+                'title': f'Event {i}',
+                'description': 'Pagination benchmark event',
+                'category': 'Music',
+                'location': 'Benchmark Arena',
+                'date': start + timedelta(minutes=i),
+                'price': 50.0,
+                'image_url': 'https://picsum.photos/800/450',
+                'available_tickets': 100,
+                'organizer_name': 'Bench',
+                'created_at': start
+            }
+            for i in range(offset, min(count, offset + BATCH_SIZE))
+        ], ordered=False)
+
+
+def time_page(query_string):
+    """Return the best of RUNS latencies in ms for one paginated request"""
+    timings = []
+    for _ in range(RUNS):
+        with app.test_request_context(f'/api/events/?{query_string}'):
+            started = time.perf_counter()
+            documents, _ = paginate(Event.objects, 'date')
+            [event.to_dict() for event in documents]
+            timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def run_benchmark():
+    """Compare page 1 and a deep page with both strategies"""
+    Event.drop_collection()
+    Event.ensure_indexes()
+    load_events(PER_PAGE * (DEEP_PAGE + 1))
+
+    # Cursor pointing just before the deep page (not timed)
+    previous = Event.objects.order_by('date', 'id').skip((DEEP_PAGE - 1) * PER_PAGE - 1).first()
+    deep_cursor = encode_cursor(previous.date, previous.id)
+
+    print(f"\n{'='*50}")
+    print(f"Pagination latency ({Event.objects.count()} events, {PER_PAGE} per page)")
+    print(f"{'='*50}")
+    print(f"skip/limit page 1:          {time_page(f'page=1&per_page={PER_PAGE}'):8.2f} ms")
+    print(f"skip/limit page {DEEP_PAGE}:       {time_page(f'page={DEEP_PAGE}&per_page={PER_PAGE}'):8.2f} ms")
+    print(f"cursor page 1:              {time_page(f'per_page={PER_PAGE}'):8.2f} ms")
+    print(f"cursor page {DEEP_PAGE}:           {time_page(f'cursor={deep_cursor}&per_page={PER_PAGE}'):8.2f} ms")
+    print(f"page 1 + include_total:     {time_page(f'per_page={PER_PAGE}&include_total=true'):8.2f} ms")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
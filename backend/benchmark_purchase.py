@@ -0,0 +1,108 @@
+"""
+Concurrency benchmark for ticket purchases
+Run with: python benchmark_purchase.py
+
+Spawns many threads that buy tickets for the same event through the
+inventory engine and reports throughput and oversell. Point BENCH_MONGODB_URI
+at a local mongod; the benchmark database is dropped afterwards.
+"""
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+THREADS = int(os.getenv('BENCH_THREADS', 500))
+PURCHASES_PER_THREAD = int(os.getenv('BENCH_PURCHASES_PER_THREAD', 4))
+STOCK = int(os.getenv('BENCH_STOCK', 1000))
+
+connect(host=MONGODB_URI, maxPoolSize=THREADS)
+
+from models import User, Event, Ticket
+from utils.inventory import sell_ticket, InventoryError
+
+
+def run_benchmark():
+    """Hammer a single event with concurrent buyers"""
+    Ticket.drop_collection()
+    Event.drop_collection()
+    User.drop_collection()
+
+    user = User(email='bench@example.com', name='Bench User')
+    user.set_password('bench')
+    user.save()
+
+    event = Event(
+        title='Benchmark Concert',
+        description='Concurrency benchmark event',
+        category='Music',
+        location='Benchmark Arena',
+        date=datetime.utcnow() + timedelta(days=30),
+        price=50.0,
+        image_url='https://picsum.photos/800/450',
+        available_tickets=STOCK,
+        organizer_name='Bench'
+    )
+    event.save()
+
+    sold = []
+    rejected = []
+    errors = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(THREADS)
+
+    def buyer():
+        start_gate.wait()
+        for _ in range(PURCHASES_PER_THREAD):
+            try:
+                sell_ticket(event.id, user)
+                outcome = sold
+            except InventoryError:
+                outcome = rejected
+            except Exception:
+                outcome = errors
+            with lock:
+                outcome.append(1)
+
+    threads = [threading.Thread(target=buyer) for _ in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    event.reload()
+    ticket_count = Ticket.objects(event_id=event).count()
+    oversold = max(0, ticket_count - STOCK)
+
+    print(f"\n{'='*50}")
+    print("Purchase concurrency benchmark")
+    print(f"{'='*50}")
+    print(f"Threads:             {THREADS}")
+    print(f"Attempts:            {THREADS * PURCHASES_PER_THREAD}")
+    print(f"Initial stock:       {STOCK}")
+    print(f"Sold:                {len(sold)}")
+    print(f"Rejected (sold out): {len(rejected)}")
+    print(f"Errors:              {len(errors)}")
+    print(f"Elapsed:             {elapsed:.2f}s")
+    print(f"Purchases/sec:       {len(sold) / elapsed:.1f}")
+    print(f"Tickets in DB:       {ticket_count}")
+    print(f"Remaining stock:     {event.available_tickets}")
+    print(f"Oversold:            {oversold}")
+
+    consistent = ticket_count + event.available_tickets == STOCK
+    print(f"\n{'✅' if consistent and not oversold else '❌'} Inventory consistent: {consistent}")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
@@ -0,0 +1,83 @@
+"""
+QR rendering latency benchmark
+Run with: python benchmark_qr.py
+
+Requests ticket QR PNGs from several concurrent threads and reports p50/p99
+latency for inline rendering, cold renders through the worker pool, and
+cache hits. No database is needed.
+"""
+import os
+import time
+import threading
+from utils import qr_generator
+from utils.ticket_tokens import issue_token
+from bson import ObjectId
+
+THREADS = int(os.getenv('BENCH_THREADS', 16))
+RENDERS_PER_THREAD = int(os.getenv('BENCH_RENDERS_PER_THREAD', 25))
+QR_WORKERS = int(os.getenv('QR_RENDER_WORKERS', 2))
+QR_QUEUE_SIZE = int(os.getenv('QR_RENDER_QUEUE_SIZE', 64))
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_mode(render, tokens):
+    """Render every token from concurrent threads and return latencies in ms"""
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(THREADS)
+
+    def worker(chunk):
+        start_gate.wait()
+        for token in chunk:
+            started = time.perf_counter()
+            render(token)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    chunks = [tokens[i::THREADS] for i in range(THREADS)]
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def run_benchmark():
+    """Compare inline, pooled and cached QR rendering"""
+    total = THREADS * RENDERS_PER_THREAD
+    qr_generator.configure(QR_WORKERS, QR_QUEUE_SIZE, cache_size=total, cache_ttl=3600)
+
+    event_id = ObjectId()
+    tokens = [issue_token(ObjectId(), event_id) for _ in range(total)]
+
+    # Warm the worker pool so process start-up is not measured
+    qr_generator.render_png('warmup')
+
+    print(f"\n{'='*50}")
+    print("QR rendering latency")
+    print(f"{'='*50}")
+    print(f"Threads: {THREADS}, renders: {total}, workers: {QR_WORKERS}, queue: {QR_QUEUE_SIZE}")
+
+    modes = (
+        ('inline', qr_generator.render_qr_png),
+        ('pool', qr_generator.render_png),
+        ('cached', qr_generator.render_png),
+    )
+    for label, render in modes:
+        latencies = run_mode(render, tokens)
+        print(f"{label:>7}: p50 {percentile(latencies, 50):7.2f} ms   "
+              f"p99 {percentile(latencies, 99):7.2f} ms")
+
+    print(f"\nPNG size: {len(qr_generator.render_qr_png(tokens[0]))} bytes, token size: {len(tokens[0])} chars")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,135 @@
+"""
+Rate limiter overhead benchmark
+Run with: python benchmark_rate_limit.py
+
+Times the rate_limited wrapper around a no-op view for BENCH_CALLS
+requests (100k by default) spread over BENCH_CALLERS callers, half with
+a verified token and half anonymous, against the memory and the stubbed
+shared backend. Exits non-zero if the added cost exceeds
+MAX_OVERHEAD_US per request on the memory backend, if a caller over its
+limit is not rejected with 429 and Retry-After, or if forged token
+subjects on the login route escape the per-IP bucket.
+"""
+import base64
+import json
+import os
+import sys
+import time
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+from utils import rate_limit
+from utils.rate_limit import rate_limited
+
+CALLS = int(os.getenv('BENCH_CALLS', 100_000))
+CALLERS = int(os.getenv('BENCH_CALLERS', 1000))
+MAX_OVERHEAD_US = 20
+
+app = Flask(__name__)
+app.config['JWT_SECRET_KEY'] = 'benchmark-secret'
+JWTManager(app)
+
+
+def signed_bearer(subject):
+    """A valid access token for `subject`"""
+    with app.app_context():
+        return f'Bearer {create_access_token(identity=subject)}'
+
+
+def bearer(subject):
+    """An unsigned token carrying `subject`, as a bot would forge it"""
+    payload = base64.urlsafe_b64encode(json.dumps({'sub': subject}).encode()).rstrip(b'=').decode()
+    return f'Bearer e30.{payload}.sig'
+
+
+def view():
+    return 'ok'
+
+
+limited_view = rate_limited('purchase')(view)
+login_view = rate_limited('login')(view)
+app.add_url_rule('/api/tickets/purchase', 'purchase_ticket', limited_view, methods=['POST'])
+app.add_url_rule('/api/auth/login', 'login', login_view, methods=['POST'])
+
+
+def request_contexts():
+    """One pushed request context per caller, reused across calls"""
+    contexts = []
+    for i in range(CALLERS):
+        headers = {'Authorization': signed_bearer(f'user{i}')} if i % 2 else {}
+        contexts.append(app.test_request_context(
+            '/api/tickets/purchase', method='POST', headers=headers,
+            environ_base={'REMOTE_ADDR': f'10.0.{i // 256}.{i % 256}'}
+        ))
+    return contexts
+
+
+def time_calls(fn, contexts):
+    """Mean µs per call of `fn` across the callers' request contexts"""
+    elapsed = 0.0
+    per_caller = CALLS // len(contexts)
+    for ctx in contexts:
+        with ctx:
+            if 'Authorization' in ctx.request.headers:
+                verify_jwt_in_request()  # done by @jwt_required() above the limiter
+            started = time.perf_counter()
+            for _ in range(per_caller):
+                fn()
+            elapsed += time.perf_counter() - started
+    return elapsed / (per_caller * len(contexts)) * 1e6
+
+
+def check_rejection():
+    """A caller past its burst gets 429 with a Retry-After header"""
+    rate_limit.configure('memory', limits={'purchase': '3/minute'})
+    with app.test_request_context('/api/tickets/purchase', method='POST'):
+        results = [limited_view() for _ in range(4)]
+    body, status, headers = results[-1]
+    return results[:3] == ['ok'] * 3 and status == 429 and int(headers['Retry-After']) >= 1
+
+
+def check_forged_subjects():
+    """Unverified tokens with fresh subjects still share their IP's login bucket"""
+    rate_limit.configure('memory', limits={'login': '3/minute'})
+    results = []
+    for i in range(4):
+        with app.test_request_context('/api/auth/login', method='POST', headers={
+            'Authorization': bearer(f'forged{i}')
+        }):
+            results.append(login_view())
+    return results[:3] == ['ok'] * 3 and results[3][1] == 429
+
+
+def run_benchmark():
+    """Report per-request limiter overhead for each backend"""
+    contexts = request_contexts()
+    limits = {'purchase': f'{CALLS * 10}/second'}  # never throttles, always does the work
+
+    baseline = time_calls(view, contexts)
+    overheads = {}
+    for backend in ('memory', 'shared'):
+        rate_limit.configure(backend, limits=limits)
+        overheads[backend] = time_calls(limited_view, contexts) - baseline
+
+    print(f"\n{'='*60}")
+    print(f"{CALLS} requests from {CALLERS} callers")
+    print(f"{'='*60}")
+    for backend, overhead in overheads.items():
+        print(f"{backend + ' backend:':<18}{overhead:>8.2f} µs/request limiter overhead")
+
+    ok = True
+    if overheads['memory'] > MAX_OVERHEAD_US:
+        print(f"❌ Limiter overhead exceeds {MAX_OVERHEAD_US} µs per request")
+        ok = False
+    if not check_rejection():
+        print("❌ A caller over its limit was not rejected with 429 and Retry-After")
+        ok = False
+    if not check_forged_subjects():
+        print("❌ Forged token subjects escaped the per-IP login limit")
+        ok = False
+    if ok:
+        print(f"✅ Limiter overhead under {MAX_OVERHEAD_US} µs, excess traffic rejected")
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_benchmark() else 1)
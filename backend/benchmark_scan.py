@@ -0,0 +1,111 @@
+"""
+Gate scan lookup benchmark
+Run with: python benchmark_scan.py
+
+Loads BENCH_TICKETS synthetic tickets (1M by default) and compares the
+latency of resolving a scanned QR code through the indexed qr_digest with
+the old unindexed qr_code match. Point BENCH_MONGODB_URI at a local mongod;
+the benchmark database is dropped afterwards.
+"""
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+TICKETS = int(os.getenv('BENCH_TICKETS', 1_000_000))
+INDEXED_LOOKUPS = int(os.getenv('BENCH_INDEXED_LOOKUPS', 2000))
+SCAN_LOOKUPS = int(os.getenv('BENCH_SCAN_LOOKUPS', 5))
+BATCH_SIZE = 10_000
+
+connect(host=MONGODB_URI)
+
+from models import Ticket
+from utils.ticket_tokens import issue_token, qr_digest
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_tickets():
+    """Bulk insert synthetic tickets and return a sample of their tokens"""
+    collection = Ticket._get_collection()
+    event_ids = [ObjectId() for _ in range(50)]
+    user_id = ObjectId()
+    event_date = datetime.utcnow() + timedelta(days=30)
+    sample = []
+
+    started = time.perf_counter()
+    for offset in range(0, TICKETS, BATCH_SIZE):
+        docs = []
+        for _ in range(min(BATCH_SIZE, TICKETS - offset)):
+            ticket_id = ObjectId()
+            event_id = random.choice(event_ids)
+            token = issue_token(ticket_id, event_id)
+            docs.append({
+                '_id': ticket_id,
+                'event_id': event_id,
+                'user_id': user_id,
+                'event_title': 'Benchmark Concert',
+                'event_location': 'Benchmark Arena',
+                'event_date': event_date,
+                'status': 'active',
+                'purchase_date': datetime.utcnow(),
+                'price': 50.0,
+                'qr_code': token,
+                'qr_digest': qr_digest(token)
+            })
+        collection.insert_many(docs, ordered=False)
+        sample.extend(doc['qr_code'] for doc in random.sample(docs, min(50, len(docs))))
+    print(f"Loaded {TICKETS} tickets in {time.perf_counter() - started:.1f}s")
+    return sample
+
+
+def time_lookups(tokens, lookup):
+    """Return lookup latencies in ms"""
+    latencies = []
+    for token in tokens:
+        started = time.perf_counter()
+        assert lookup(token) is not None
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def run_benchmark():
+    """Compare indexed digest lookups with full collection scans"""
+    Ticket.drop_collection()
+    Ticket.ensure_indexes()
+    sample = load_tickets()
+
+    indexed = time_lookups(
+        random.choices(sample, k=INDEXED_LOOKUPS),
+        lambda token: Ticket.objects(qr_digest=qr_digest(token)).first()
+    )
+    scanned = time_lookups(
+        random.choices(sample, k=SCAN_LOOKUPS),
+        lambda token: Ticket.objects(qr_code=token).first()
+    )
+
+    print(f"\n{'='*50}")
+    print(f"Gate scan lookup at {TICKETS} tickets")
+    print(f"{'='*50}")
+    print(f"qr_digest (indexed): p50 {percentile(indexed, 50):8.3f} ms   p99 {percentile(indexed, 99):8.3f} ms")
+    print(f"qr_code (scan):      p50 {percentile(scanned, 50):8.3f} ms   p99 {percentile(scanned, 99):8.3f} ms")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
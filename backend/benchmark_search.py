@@ -0,0 +1,111 @@
+"""
+Event search benchmark
+Run with: python benchmark_search.py
+
+Loads BENCH_EVENTS synthetic events (100k by default) and compares the old
+triple icontains regex search with the MongoDB text index and the
+in-process inverted index. Point BENCH_MONGODB_URI at a local mongod; the
+benchmark database is dropped afterwards.
+"""
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from mongoengine import connect, disconnect, Q
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+EVENTS = int(os.getenv('BENCH_EVENTS', 100_000))
+RUNS = int(os.getenv('BENCH_RUNS', 10))
+PER_PAGE = 20
+BATCH_SIZE = 10_000
+
+WORDS = ['summer', 'music', 'festival', 'rock', 'jazz', 'comedy', 'night', 'tech', 'conference',
+         'theater', 'opera', 'football', 'final', 'wine', 'food', 'charity', 'gala', 'dance',
+         'symphony', 'stand', 'up', 'live', 'tour', 'open', 'air', 'classic', 'indie', 'film']
+CITIES = ['Istanbul', 'Ankara', 'Izmir', 'Antalya', 'Bursa', 'London', 'Berlin', 'Paris', 'New York']
+QUERIES = ['jazz', 'rock festival', 'istanbul', 'symphony night', 'charity gala ankara']
+
+connect(host=MONGODB_URI)
+
+from models import Event
+from utils import search
+
+
+def load_events():
+    """Bulk insert synthetic events with random titles and descriptions"""
+    collection = Event._get_collection()
+    start = datetime.utcnow()
+    for offset in range(0, EVENTS, BATCH_SIZE):
+        collection.insert_many([
+            {
+                'title': ' '.join(random.sample(WORDS, 3)).title(),
+                'description': ' '.join(random.choices(WORDS, k=30)),
+                'category': 'Music',
+                'location': f'{random.choice(CITIES)} Arena',
+                'date': start + timedelta(minutes=i),
+                'price': 50.0,
+                'image_url': 'https://picsum.photos/800/450',
+                'available_tickets': 100,
+                'organizer_name': 'Bench',
+                'created_at': start
+            }
+            for i in range(offset, min(EVENTS, offset + BATCH_SIZE))
+        ], ordered=False)
+
+
+def regex_search(text):
+    return list(Event.objects(
+        Q(title__icontains=text) | Q(description__icontains=text) | Q(location__icontains=text)
+    ).order_by('date').limit(PER_PAGE))
+
+
+def text_index_search(text):
+    return list(Event.objects.search_text(text).order_by('$text_score').limit(PER_PAGE))
+
+
+def memory_search(text):
+    ranked = [event_id for event_id, _ in search.index.search(text)[:PER_PAGE]]
+    return list(Event.objects(id__in=ranked))
+
+
+def best_ms(fn, text):
+    """Return the best of RUNS latencies in ms"""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        fn(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def run_benchmark():
+    """Compare the three search strategies"""
+    Event.drop_collection()
+    Event.ensure_indexes()
+    load_events()
+
+    started = time.perf_counter()
+    search.build_index()
+    print(f"In-process index built in {time.perf_counter() - started:.2f}s ({len(search.index)} events)")
+
+    print(f"\n{'='*70}")
+    print(f"Event search latency at {EVENTS} events (first {PER_PAGE} results, best of {RUNS})")
+    print(f"{'='*70}")
+    print(f"{'query':<22}{'regex':>14}{'text index':>16}{'in-process':>16}")
+    for query in QUERIES:
+        print(f"{query:<22}"
+              f"{best_ms(regex_search, query):>11.2f} ms"
+              f"{best_ms(text_index_search, query):>13.2f} ms"
+              f"{best_ms(memory_search, query):>13.2f} ms")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
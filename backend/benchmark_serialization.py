@@ -0,0 +1,207 @@
+"""
+List serialization benchmark
+Run with: python benchmark_serialization.py
+
+Loads BENCH_DOCUMENTS events and as many tickets (10k by default), then
+times turning each list into a JSON body three ways: the previous model
+to_dict() (which dereferences organizer, event and user references),
+the raw-document serializers with the standard json encoder, and the
+raw-document serializers with orjson when it is installed. Also counts
+the MongoDB commands each path issues. Point BENCH_MONGODB_URI at a
+local mongod; the benchmark database is dropped afterwards.
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import monitoring
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+DOCUMENTS = int(os.getenv('BENCH_DOCUMENTS', 10_000))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+connect(host=MONGODB_URI, event_listeners=[counter])
+
+from models import Event, Ticket, User
+from utils.serializers import event_dict, ticket_dict, stored_fields, EVENT_FIELDS, TICKET_FIELDS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_data():
+    """Bulk insert an organizer, a buyer, DOCUMENTS events and DOCUMENTS tickets"""
+    now = datetime.utcnow()
+    organizer_id, buyer_id = ObjectId(), ObjectId()
+    User._get_collection().insert_many([
+        {'_id': user_id, 'email': f'{user_id}@bench.test', 'password_hash': 'x',
+         'name': 'Bench', 'role': role, 'created_at': now}
+        for user_id, role in ((organizer_id, 'organizer'), (buyer_id, 'user'))
+    ])
+    events = [
+        {
+            '_id': ObjectId(),
+            'title': f'Serialization Benchmark {i}',
+            'description': 'Serialization benchmark event',
+            'category': 'Music',
+            'location': 'Benchmark Arena',
+            'date': now + timedelta(days=30, minutes=i),
+            'price': 50.0,
+            'image_url': 'https://picsum.photos/800/450',
+            'available_tickets': 100,
+            'organizer_name': 'Bench',
+            'organizer_id': organizer_id,
+            'created_at': now
+        }
+        for i in range(DOCUMENTS)
+    ]
+    Event._get_collection().insert_many(events, ordered=False)
+    Ticket._get_collection().insert_many([
+        {
+            '_id': ObjectId(),
+            'event_id': event['_id'],
+            'user_id': buyer_id,
+            'event_title': event['title'],
+            'event_location': event['location'],
+            'event_date': event['date'],
+            'status': 'active',
+            'purchase_date': now,
+            'price': 50.0,
+            'qr_code': f'bench-{event["_id"]}'
+        }
+        for event in events
+    ], ordered=False)
+
+
+def legacy_event(event):
+    """The previous Event.to_dict()"""
+    return {
+        'id': str(event.id),
+        'title': event.title,
+        'description': event.description,
+        'category': event.category,
+        'location': event.location,
+        'date': event.date.isoformat(),
+        'price': event.price,
+        'imageUrl': event.image_url,
+        'availableTickets': event.available_tickets,
+        'organizerName': event.organizer_name,
+        'organizerId': str(event.organizer_id.id) if event.organizer_id else None
+    }
+
+
+def legacy_ticket(ticket):
+    """The previous Ticket.to_dict()"""
+    return {
+        'id': str(ticket.id),
+        'eventId': str(ticket.event_id.id) if ticket.event_id else None,
+        'eventTitle': ticket.event_title,
+        'eventLocation': ticket.event_location,
+        'eventDate': ticket.event_date.isoformat(),
+        'userId': str(ticket.user_id.id) if ticket.user_id else None,
+        'status': f'TicketStatus.{ticket.status}',
+        'purchaseDate': ticket.purchase_date.isoformat(),
+        'price': ticket.price,
+        'qrCode': ticket.qr_code,
+        'seatNumber': ticket.seat_number,
+        'expiresAt': ticket.expires_at.isoformat() if ticket.expires_at else None
+    }
+
+
+def std_dumps(obj):
+    return json.dumps(obj, sort_keys=True)
+
+
+def orjson_dumps(obj):
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+
+def legacy_path(model, serialize, dumps):
+    return lambda: dumps([serialize(document) for document in model.objects])
+
+
+def raw_path(model, fields, serialize, dumps):
+    return lambda: dumps([serialize(doc) for doc in model.objects.only(*stored_fields(fields)).as_pymongo()])
+
+
+def measure(fn):
+    """Return (body, commands issued, elapsed ms)"""
+    counter.count = 0
+    started = time.perf_counter()
+    body = fn()
+    return body, counter.count, (time.perf_counter() - started) * 1000
+
+
+def run_benchmark():
+    """Compare the previous and the raw serialization paths for both lists"""
+    for model in (Event, Ticket, User):
+        model.drop_collection()
+        model.ensure_indexes()
+    load_data()
+
+    ok = True
+    cases = (
+        ('events', Event, EVENT_FIELDS, legacy_event, event_dict),
+        ('tickets', Ticket, TICKET_FIELDS, legacy_ticket, ticket_dict),
+    )
+    print(f"\n{'='*64}")
+    print(f"Serializing {DOCUMENTS} documents per list")
+    print(f"{'='*64}")
+    for name, model, fields, legacy, serialize in cases:
+        paths = [
+            ('to_dict + json', legacy_path(model, legacy, std_dumps)),
+            ('raw + json', raw_path(model, fields, serialize, std_dumps)),
+        ]
+        if orjson is not None:
+            paths.append(('raw + orjson', raw_path(model, fields, serialize, orjson_dumps)))
+
+        bodies = []
+        for label, fn in paths:
+            body, commands, elapsed = measure(fn)
+            bodies.append(json.loads(body))
+            print(f"{name + ', ' + label + ':':<28}{commands:>7} commands {elapsed:>10.1f} ms")
+        if any(body != bodies[0] for body in bodies[1:]):
+            print(f"❌ The {name} serializers disagree with the previous to_dict()")
+            ok = False
+
+    if orjson is None:
+        print("(orjson not installed, skipped)")
+    if ok:
+        print("✅ Raw serializers match the previous output")
+    return ok
+
+
+if __name__ == '__main__':
+    ok = False
+    try:
+        ok = run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,154 @@
+"""
+Organizer stats benchmark
+Run with: python benchmark_stats.py
+
+Loads BENCH_TICKETS synthetic tickets (1M by default) spread over one
+organizer's events and compares the old stats computation, which loads
+every Ticket document into Python, with the $match/$group aggregation and
+with the materialized sales counters (backfilled by a reconcile run).
+Point BENCH_MONGODB_URI at a local mongod; the benchmark database is
+dropped afterwards.
+"""
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+TICKETS = int(os.getenv('BENCH_TICKETS', 1_000_000))
+EVENTS = int(os.getenv('BENCH_EVENTS', 200))
+RUNS = int(os.getenv('BENCH_RUNS', 3))
+BATCH_SIZE = 10_000
+STATUSES = ['active'] * 6 + ['used'] * 3 + ['pending']
+
+connect(host=MONGODB_URI)
+
+from models import Event, Ticket
+from utils.organizer_stats import compute_stats, ticket_totals
+from utils.sales_counters import reconcile
+from utils.ticket_tokens import issue_token, qr_digest
+
+
+def load_data(organizer_id):
+    """Bulk insert an organizer's events and their tickets"""
+    start = datetime.utcnow()
+    events = [
+        {
+            '_id': ObjectId(),
+            'title': f'Event {i}',
+            'description': 'Stats benchmark event',
+            'category': 'Music',
+            'location': 'Benchmark Arena',
+            'date': start + timedelta(days=i - EVENTS // 2),
+            'price': 50.0,
+            'image_url': 'https://picsum.photos/800/450',
+            'available_tickets': 0,
+            'organizer_id': organizer_id,
+            'organizer_name': 'Bench',
+            'created_at': start
+        }
+        for i in range(EVENTS)
+    ]
+    Event._get_collection().insert_many(events)
+
+    collection = Ticket._get_collection()
+    user_id = ObjectId()
+    started = time.perf_counter()
+    for offset in range(0, TICKETS, BATCH_SIZE):
+        docs = []
+        for _ in range(min(BATCH_SIZE, TICKETS - offset)):
+            ticket_id = ObjectId()
+            event = random.choice(events)
+            token = issue_token(ticket_id, event['_id'])
+            docs.append({
+                '_id': ticket_id,
+                'event_id': event['_id'],
+                'user_id': user_id,
+                'event_title': event['title'],
+                'event_location': event['location'],
+                'event_date': event['date'],
+                'status': random.choice(STATUSES),
+                'purchase_date': start,
+                'price': random.choice([25.0, 50.0, 75.0]),
+                'qr_code': token,
+                'qr_digest': qr_digest(token)
+            })
+        collection.insert_many(docs, ordered=False)
+    print(f"Loaded {TICKETS} tickets over {EVENTS} events in {time.perf_counter() - started:.1f}s")
+
+
+def legacy_stats(organizer_id):
+    """The previous implementation: hydrate every ticket and sum in Python"""
+    events = Event.objects(organizer_id=organizer_id)
+    total_events = events.count()
+    upcoming_events = events.filter(date__gt=datetime.now()).count()
+    tickets = Ticket.objects(event_id__in=[event for event in events])
+    return {
+        'totalEvents': total_events,
+        'upcomingEvents': upcoming_events,
+        'totalTicketsSold': tickets.count(),
+        'totalRevenue': sum([float(ticket.price) if ticket.price else 0.0 for ticket in tickets])
+    }
+
+
+def aggregation_stats(organizer_id):
+    """Ticket totals from one $match/$group over the organizer's events"""
+    event_ids = Event.objects(organizer_id=organizer_id).scalar('id')
+    totals = ticket_totals(list(event_ids))
+    return {
+        'totalTicketsSold': sum(count for statuses in totals.values() for count, _ in statuses.values()),
+        'totalRevenue': sum(revenue for statuses in totals.values() for _, revenue in statuses.values())
+    }
+
+
+def best_seconds(fn, organizer_id):
+    """Return (best of RUNS latency in seconds, last result)"""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = fn(organizer_id)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def run_benchmark():
+    """Compare the legacy, aggregation and counter stats"""
+    Event.drop_collection()
+    Ticket.drop_collection()
+    Event.ensure_indexes()
+    Ticket.ensure_indexes()
+    organizer_id = ObjectId()
+    load_data(organizer_id)
+
+    started = time.perf_counter()
+    reconcile(fix=True)
+    print(f"Backfilled sales counters in {time.perf_counter() - started:.1f}s")
+
+    legacy_time, legacy = best_seconds(legacy_stats, organizer_id)
+    pipeline_time, totals = best_seconds(aggregation_stats, organizer_id)
+    counter_time, stats = best_seconds(compute_stats, organizer_id)
+
+    assert legacy['totalTicketsSold'] == totals['totalTicketsSold'] == TICKETS
+    assert abs(legacy['totalRevenue'] - totals['totalRevenue']) < 1e-6 * legacy['totalRevenue']
+    assert stats['totalTicketsSold'] == TICKETS - Ticket.objects(status='pending').count()
+
+    print(f"\n{'='*50}")
+    print(f"Organizer stats at {TICKETS} tickets (best of {RUNS})")
+    print(f"{'='*50}")
+    print(f"load every ticket: {legacy_time * 1000:10.1f} ms")
+    print(f"aggregation:       {pipeline_time * 1000:10.1f} ms")
+    print(f"counters:          {counter_time * 1000:10.1f} ms")
+
+
+if __name__ == '__main__':
+    try:
+        run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
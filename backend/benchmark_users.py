@@ -0,0 +1,134 @@
+"""
+User resolution query-count benchmark
+Run with: python benchmark_users.py
+
+Replays BENCH_REQUESTS authenticated requests (2k by default) from
+BENCH_USERS users, each resolving its caller the way a ticket purchase
+does: once for the token version check and once in the handler. Counts
+the MongoDB commands issued by the legacy per-call User query and by
+utils.users with and without its process cache, and exits non-zero if a
+request resolves its caller more than once. Point BENCH_MONGODB_URI at a
+local mongod; the benchmark database is dropped afterwards.
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from bson import ObjectId
+from pymongo import monitoring
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+USERS = int(os.getenv('BENCH_USERS', 200))
+REQUESTS = int(os.getenv('BENCH_REQUESTS', 2000))
+LOOKUPS_PER_REQUEST = 2
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+connect(host=MONGODB_URI, event_listeners=[counter])
+
+from flask import Flask
+from models import User
+from utils import users
+
+app = Flask(__name__)
+
+
+def load_users():
+    """Bulk insert the benchmark users, returning their ids as strings"""
+    now = datetime.utcnow()
+    docs = [
+        {
+            '_id': ObjectId(),
+            'email': f'user{i}@bench.test',
+            'password_hash': 'x',
+            'name': f'User {i}',
+            'role': 'user',
+            'token_version': 0,
+            'created_at': now
+        }
+        for i in range(USERS)
+    ]
+    User._get_collection().insert_many(docs, ordered=False)
+    return [str(doc['_id']) for doc in docs]
+
+
+def legacy_lookup(user_id):
+    """The previous implementation: a full User query at every call site"""
+    return User.objects(id=user_id).first()
+
+
+def replay(callers, lookup):
+    """Run one request per caller, resolving it LOOKUPS_PER_REQUEST times"""
+    for user_id in callers:
+        with app.test_request_context('/api/tickets/purchase', method='POST'):
+            for _ in range(LOOKUPS_PER_REQUEST):
+                assert lookup(user_id) is not None
+
+
+def measure(callers, lookup):
+    """Return (commands per request, elapsed µs per request)"""
+    counter.count = 0
+    started = time.perf_counter()
+    replay(callers, lookup)
+    elapsed = time.perf_counter() - started
+    return counter.count / len(callers), elapsed / len(callers) * 1e6
+
+
+def run_benchmark():
+    """Compare commands per request of the legacy lookup and utils.users"""
+    User.drop_collection()
+    User.ensure_indexes()
+    ids = load_users()
+    callers = [random.choice(ids) for _ in range(REQUESTS)]
+
+    legacy = measure(callers, legacy_lookup)
+    users.configure(ttl=0)
+    memo_only = measure(callers, users.resolve_user)
+    users.configure(cache_size=USERS * 2, ttl=30)
+    cached = measure(callers, users.resolve_user)
+
+    print(f"\n{'='*60}")
+    print(f"{REQUESTS} requests from {USERS} users, {LOOKUPS_PER_REQUEST} lookups each")
+    print(f"{'='*60}")
+    print(f"legacy query per call:   {legacy[0]:>6.2f} commands/request {legacy[1]:>9.1f} µs/request")
+    print(f"request memo only:       {memo_only[0]:>6.2f} commands/request {memo_only[1]:>9.1f} µs/request")
+    print(f"memo + process cache:    {cached[0]:>6.2f} commands/request {cached[1]:>9.1f} µs/request")
+    print(f"cache stats:             {users.stats()}")
+
+    if memo_only[0] > 1:
+        print("❌ A request resolved its caller more than once")
+        return False
+    print("✅ Each request resolves its caller at most once")
+    return True
+
+
+if __name__ == '__main__':
+    ok = False
+    try:
+        ok = run_benchmark()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
+    sys.exit(0 if ok else 1)
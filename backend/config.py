@@ -23,6 +23,59 @@ class Config:
     # CORS Configuration
     CORS_HEADERS = 'Content-Type'
     
+    # Maximum tickets in a single batch purchase
+    MAX_TICKETS_PER_ORDER = int(os.getenv('MAX_TICKETS_PER_ORDER', 20))
+    
+    # Ticket QR codes: tickets store a signed token, PNGs are rendered on demand
+    TICKET_SIGNING_KEY = os.getenv('TICKET_SIGNING_KEY', 'ticket-signing-key-change-this-in-production')
+    BUNDLE_SIGNING_KEY = os.getenv('BUNDLE_SIGNING_KEY', 'bundle-signing-key-change-this-in-production')
+    QR_RENDER_WORKERS = int(os.getenv('QR_RENDER_WORKERS', 2))
+    QR_RENDER_QUEUE_SIZE = int(os.getenv('QR_RENDER_QUEUE_SIZE', 64))
+    QR_CACHE_SIZE = int(os.getenv('QR_CACHE_SIZE', 1024))
+    QR_CACHE_TTL = int(os.getenv('QR_CACHE_TTL', 3600))  # seconds
+    
+    # Maximum scan records in one gate sync upload
+    MAX_SCANS_PER_SYNC = int(os.getenv('MAX_SCANS_PER_SYNC', 10000))
+    
+    # Reservation holds
+    RESERVATION_HOLD_MINUTES = int(os.getenv('RESERVATION_HOLD_MINUTES', 10))
+    RESERVATION_SWEEP_INTERVAL = int(os.getenv('RESERVATION_SWEEP_INTERVAL', 60))  # seconds, 0 disables
+    
+    # Event search: 'mongo' uses the text index, 'memory' an in-process inverted index
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'mongo')
+    # Seconds between checks for event writes from other workers; in-process indexes
+    # are rebuilt when the 'events' version moved (0 disables)
+    SEARCH_REFRESH_INTERVAL = int(os.getenv('SEARCH_REFRESH_INTERVAL', 5))
+    
+    # Public event response cache: 'memory', 'shared' (Redis at REDIS_URL) or 'none'
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 30))  # seconds
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 2048))
+    REDIS_URL = os.getenv('REDIS_URL')
+    
+    # Token-bucket rate limits as "N/period" (second, minute or hour), per caller and route;
+    # backend 'memory' (per worker), 'shared' (REDIS_URL) or 'none'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_LOGIN = os.getenv('RATE_LIMIT_LOGIN', '10/minute')
+    RATE_LIMIT_PURCHASE = os.getenv('RATE_LIMIT_PURCHASE', '20/minute')
+    RATE_LIMIT_VALIDATE = os.getenv('RATE_LIMIT_VALIDATE', '20/second')
+    
+    # Password hashing: Werkzeug method string with cost, e.g. 'scrypt:32768:8:1'
+    # or 'pbkdf2:sha256:600000'; older hashes are upgraded on login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 64))
+    
+    # Resolved users cached per process; 0 disables the cache
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))  # seconds
+    # Token versions checked on every authenticated request; bounds how long a
+    # revoked token keeps working in other workers (0 reads it every time)
+    TOKEN_VERSION_CACHE_TTL = int(os.getenv('TOKEN_VERSION_CACHE_TTL', 30))  # seconds
+    
+    # JSON encoder: 'auto' (orjson if installed), 'orjson' or 'json'
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+    
     # Pagination
     ITEMS_PER_PAGE = 20
 
@@ -25,6 +25,7 @@ def create_organizer_user():
     if existing:
         print(f"⚠️  Organizer user already exists. Updating role...")
         existing.role = 'organizer'
+        existing.token_version = (existing.token_version or 0) + 1  # Reissue tokens with the new role
         existing.save()
         print(f"✅ Updated existing user to organizer role")
         return existing
@@ -0,0 +1,56 @@
+"""
+Replace base64 QR images stored in tickets with compact signed tokens
+Run with: python migrate_qr_tokens.py
+
+Tickets whose qr_code still holds a data:image/png;base64 blob get a token
+from utils.ticket_tokens; the PNG is rendered on demand by
+GET /api/tickets/<id>/qr.png. Every ticket also gets the indexed qr_digest
+used by gate validation. Safe to run more than once.
+"""
+from mongoengine import connect
+from pymongo import UpdateOne
+import certifi
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BATCH_SIZE = 1000
+
+# Connect to MongoDB
+mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/bilet_app')
+print(f"🔗 Connecting to MongoDB...")
+connect(host=mongodb_uri, tlsCAFile=certifi.where())
+print(f"✅ Connected!")
+
+# Import models after connection
+from models import Ticket
+from utils import ticket_tokens
+
+ticket_tokens.configure(os.getenv('TICKET_SIGNING_KEY', 'ticket-signing-key-change-this-in-production'))
+
+collection = Ticket._get_collection()
+cursor = collection.find(
+    {'$or': [{'qr_code': {'$regex': '^data:image/'}}, {'qr_digest': {'$exists': False}}]},
+    projection={'_id': 1, 'event_id': 1, 'qr_code': 1}
+)
+
+migrated = 0
+batch = []
+for doc in cursor:
+    token = doc.get('qr_code', '')
+    if token.startswith('data:image/'):
+        token = ticket_tokens.issue_token(doc['_id'], doc['event_id'])
+    batch.append(UpdateOne(
+        {'_id': doc['_id']},
+        {'$set': {'qr_code': token, 'qr_digest': ticket_tokens.qr_digest(token)}}
+    ))
+    if len(batch) >= BATCH_SIZE:
+        migrated += collection.bulk_write(batch, ordered=False).modified_count
+        batch = []
+        print(f"   Migrated {migrated} tickets...")
+
+if batch:
+    migrated += collection.bulk_write(batch, ordered=False).modified_count
+
+print(f"\n🎉 Done! Rewrote QR codes for {migrated} tickets.")
@@ -35,5 +35,8 @@ db = MongoEngineWrapper()
 from .user import User
 from .event import Event
 from .ticket import Ticket
+from .resource_version import ResourceVersion
+from .sales_counter import SalesCounter
+from .sales_bucket import SalesBucket
 
-__all__ = ['db', 'User', 'Event', 'Ticket']
+__all__ = ['db', 'User', 'Event', 'Ticket', 'ResourceVersion', 'SalesCounter', 'SalesBucket']
@@ -1,13 +1,26 @@
 """Event model for MongoDB"""
 from datetime import datetime
 from mongoengine import Document, StringField, DateTimeField, FloatField, IntField, ReferenceField
+from utils.serializers import event_dict
 
 
 class Event(Document):
     """Event model for ticket booking system"""
     meta = {
         'collection': 'events',
-        'indexes': ['category', 'date'],
+        'indexes': [
+            'category', 'date',
+            ('date', 'id'),  # Keyset pagination for public listings
+            ('category', 'date', 'id'),
+            ('organizer_id', '-created_at', '-id'),  # Organizer dashboard listing
+            ('organizer_id', 'date'),  # Organizer stats event counts
+            {
+                # Weighted full-text search, no stemming so results match utils.search
+                'fields': ['$title', '$location', '$description'],
+                'default_language': 'none',
+                'weights': {'title': 10, 'location': 5, 'description': 1}
+            }
+        ],
         'strict': False  # Allow documents with fields not defined in the model
     }
     
@@ -23,21 +36,14 @@ class Event(Document):
     organizer_id = ReferenceField('User')  # Link to organizer user
     created_at = DateTimeField(default=datetime.utcnow)
     
+    def ref_id(self, field):
+        """Return the ObjectId stored in a reference field without dereferencing it"""
+        value = self._data.get(field)
+        return getattr(value, 'id', value)
+    
     def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'title': self.title,
-            'description': self.description,
-            'category': self.category,
-            'location': self.location,
-            'date': self.date.isoformat(),
-            'price': self.price,
-            'imageUrl': self.image_url,
-            'availableTickets': self.available_tickets,
-            'organizerName': self.organizer_name,
-            'organizerId': str(self.organizer_id.id) if self.organizer_id else None
-        }
+        """Convert to dictionary (references are written as ids, never dereferenced)"""
+        return event_dict(dict(self._data, _id=self.id))
     
     @property
     def is_upcoming(self):
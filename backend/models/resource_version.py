@@ -0,0 +1,15 @@
+"""Resource version counters for conditional GET support"""
+from mongoengine import Document, StringField, IntField
+
+
+class ResourceVersion(Document):
+    """Monotonic change counter for a collection or a slice of one"""
+    meta = {
+        'collection': 'resource_versions'
+    }
+    
+    key = StringField(primary_key=True, max_length=100)
+    version = IntField(required=True, default=0)
+    
+    def __repr__(self):
+        return f'<ResourceVersion {self.key}={self.version}>'
@@ -0,0 +1,26 @@
+"""Hourly sales rollup model"""
+from mongoengine import Document, DateTimeField, IntField, FloatField, ObjectIdField
+
+
+class SalesBucket(Document):
+    """Ticket sales of one event within one UTC hour.
+
+    Sales are bucketed by purchase time, cancellations by the time they
+    happened, so `sold` and `revenue` are gross figures.
+    """
+    meta = {
+        'collection': 'sales_buckets',
+        'indexes': [
+            {'fields': ['event_id', 'hour'], 'unique': True}
+        ]
+    }
+    
+    event_id = ObjectIdField(required=True)
+    hour = DateTimeField(required=True)  # Start of the hour, UTC
+    sold = IntField(default=0)
+    revenue = FloatField(default=0.0)
+    cancelled = IntField(default=0)
+    refunded = FloatField(default=0.0)
+    
+    def __repr__(self):
+        return f'<SalesBucket {self.event_id} {self.hour}>'
@@ -0,0 +1,26 @@
+"""Materialized sales counters"""
+from mongoengine import Document, StringField, IntField, FloatField, ObjectIdField
+
+
+class SalesCounter(Document):
+    """Running sales totals for one event or one organizer.
+
+    Keys are 'event:<id>' or 'organizer:<id>'. Pending holds are not sales:
+    a ticket counts once it is active, and `sold`/`revenue` cover every
+    existing active, used or expired ticket.
+    """
+    meta = {
+        'collection': 'sales_counters',
+        'indexes': ['organizer_id']
+    }
+    
+    key = StringField(primary_key=True, max_length=100)
+    organizer_id = ObjectIdField()  # Owner of the event, on event counters only
+    sold = IntField(default=0)
+    used = IntField(default=0)
+    expired = IntField(default=0)
+    cancelled = IntField(default=0)
+    revenue = FloatField(default=0.0)
+    
+    def __repr__(self):
+        return f'<SalesCounter {self.key}>'
@@ -3,13 +3,20 @@ from datetime import datetime
 from mongoengine import Document, StringField, DateTimeField, FloatField, ReferenceField
 from .user import User
 from .event import Event
+from utils.ticket_tokens import qr_digest
+from utils.serializers import ticket_dict
 
 
 class Ticket(Document):
     """Ticket model for event bookings"""
     meta = {
         'collection': 'tickets',
-        'indexes': ['event_id', 'user_id', 'event_date', 'status']
+        'indexes': [
+            'event_id', 'user_id', 'event_date', 'status', ('status', 'expires_at'), ('event_id', 'status'),
+            ('user_id', '-event_date', '-id'),  # Keyset pagination of a user's tickets
+            ('event_id', '-purchase_date', '-id'),  # Keyset pagination of an event's attendees
+            {'fields': ['qr_digest'], 'unique': True, 'sparse': True}
+        ]
     }
     
     event_id = ReferenceField(Event, required=True)
@@ -23,24 +30,26 @@ class Ticket(Document):
     status = StringField(required=True, default='active', max_length=20, choices=['active', 'used', 'expired', 'pending'])
     purchase_date = DateTimeField(default=datetime.utcnow)
     price = FloatField(required=True)
-    qr_code = StringField(required=True, max_length=10000)  # Increased for base64 image
+    qr_code = StringField(required=True, max_length=100)  # Signed ticket token, rendered as QR on demand
+    qr_digest = StringField(max_length=16)  # Indexed SHA-256 prefix of qr_code for gate lookups
     seat_number = StringField(max_length=20)
+    expires_at = DateTimeField()  # Hold deadline for pending tickets
+    used_at = DateTimeField()  # When the ticket was scanned at the gate
+    scanner_id = StringField(max_length=100)  # Gate device that admitted the ticket
+    
+    def clean(self):
+        """Keep the lookup digest in sync with the QR code"""
+        if self.qr_code:
+            self.qr_digest = qr_digest(self.qr_code)
+    
+    def ref_id(self, field):
+        """Return the ObjectId stored in a reference field without dereferencing it"""
+        value = self._data.get(field)
+        return getattr(value, 'id', value)
     
     def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'eventId': str(self.event_id.id) if self.event_id else None,
-            'eventTitle': self.event_title,
-            'eventLocation': self.event_location,
-            'eventDate': self.event_date.isoformat(),
-            'userId': str(self.user_id.id) if self.user_id else None,
-            'status': f'TicketStatus.{self.status}',
-            'purchaseDate': self.purchase_date.isoformat(),
-            'price': self.price,
-            'qrCode': self.qr_code,
-            'seatNumber': self.seat_number
-        }
+        """Convert to dictionary (references are written as ids, never dereferenced)"""
+        return ticket_dict(dict(self._data, _id=self.id))
     
     @property
     def is_upcoming(self):
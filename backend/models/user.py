@@ -1,7 +1,8 @@
 """User model for MongoDB"""
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from mongoengine import Document, StringField, DateTimeField
+from mongoengine import Document, StringField, DateTimeField, IntField
+from utils.passwords import hash_password, verify_password, needs_rehash
+from utils.serializers import user_dict
 
 
 class User(Document):
@@ -17,25 +18,23 @@ class User(Document):
     phone = StringField(max_length=20)
     role = StringField(required=True, default='user', choices=['user', 'organizer', 'admin'])
     created_at = DateTimeField(default=datetime.utcnow)
+    token_version = IntField(default=0)  # Bumped to revoke every token issued before
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Check if password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Whether the stored hash predates the configured hash method or cost"""
+        return needs_rehash(self.password_hash)
     
     def to_dict(self):
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'email': self.email,
-            'name': self.name,
-            'phone': self.phone,
-            'role': self.role,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
-        }
+        return user_dict(dict(self._data, _id=self.id))
     
     def __repr__(self):
         return f'<User {self.email}>'
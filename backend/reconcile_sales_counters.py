@@ -0,0 +1,40 @@
+"""
+Check the materialized sales counters against the tickets collection
+Run with: python reconcile_sales_counters.py [--fix]
+
+Recounts sold, used, expired and revenue per event and per organizer with
+one aggregation and reports every counter that drifted. With --fix the
+drifted counters are overwritten with the recount. The first run on an
+existing database, before any counter exists, backfills them all.
+Cancellations cannot be recounted, so the cancelled counter is left alone.
+"""
+from mongoengine import connect
+import certifi
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connect to MongoDB
+mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/bilet_app')
+print(f"🔗 Connecting to MongoDB...")
+connect(host=mongodb_uri, tlsCAFile=certifi.where())
+print(f"✅ Connected!")
+
+# Import after connection
+from utils.sales_counters import reconcile
+
+fix = '--fix' in sys.argv
+drift = reconcile(fix=fix)
+
+for entry in drift:
+    print(f"   {entry['key']} {entry['counter']}: stored {entry['stored']}, expected {entry['expected']}")
+
+if not drift:
+    print("\n🎉 All sales counters match the tickets.")
+elif fix:
+    print(f"\n🔧 Fixed {len(drift)} drifted counters.")
+else:
+    print(f"\n⚠️ {len(drift)} counters drifted. Run with --fix to repair them.")
+    sys.exit(1)
@@ -24,6 +24,7 @@ def reset_test_user():
     if user:
         user.set_password('test123')
         user.role = 'user'  # Ensure it's a regular user
+        user.token_version = (user.token_version or 0) + 1  # Revoke tokens with the old password or role
         user.save()
         print(f"✅ Reset test user:")
         print(f"   Email: test@example.com")
@@ -54,6 +55,7 @@ def ensure_organizer():
     if organizer:
         organizer.set_password('organizer123')
         organizer.role = 'organizer'
+        organizer.token_version = (organizer.token_version or 0) + 1  # Revoke tokens with the old password or role
         organizer.save()
         print(f"✅ Organizer user exists:")
         print(f"   Email: organizer@example.com")
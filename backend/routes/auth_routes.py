@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from models import User
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.auth_utils import issue_tokens
+from utils.users import resolve_user, invalidate_user
+from utils.passwords import hash_password, HasherBusy
+from utils.rate_limit import rate_limited
 from mongoengine.errors import NotUniqueError, ValidationError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -64,6 +68,8 @@ def register():
         description: Email already registered
       500:
         description: Internal server error
+      503:
+        description: Too many password hashes in progress, retry after Retry-After seconds
     """
     data = request.get_json()
     
@@ -84,8 +90,7 @@ def register():
         user.save()
         
         # Create tokens
-        access_token = create_access_token(identity=str(user.id))
-        refresh_token = create_refresh_token(identity=str(user.id))
+        access_token, refresh_token = issue_tokens(user)
         
         return jsonify({
             'message': 'User registered successfully',
@@ -94,6 +99,8 @@ def register():
             'refresh_token': refresh_token
         }), 201
     
+    except HasherBusy as e:
+        return jsonify({'error': e.message}), e.status_code, {'Retry-After': '1'}
     except NotUniqueError:
         return jsonify({'error': 'Email already registered'}), 409
     except ValidationError as e:
@@ -103,6 +110,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited('login')
 def login():
     """Login user
     ---
@@ -144,6 +152,10 @@ def login():
         description: Email and password are required
       401:
         description: Invalid email or password
+      429:
+        description: Too many login attempts, retry after Retry-After seconds
+      503:
+        description: Too many logins in progress, retry after Retry-After seconds
     """
     data = request.get_json()
     
@@ -154,12 +166,20 @@ def login():
     # Find user
     user = User.objects(email=data['email']).first()
     
-    if not user or not user.check_password(data['password']):
-        return jsonify({'error': 'Invalid email or password'}), 401
+    try:
+        if not user or not user.check_password(data['password']):
+            return jsonify({'error': 'Invalid email or password'}), 401
+        
+        # Upgrade hashes made with an older method or cost
+        if user.password_needs_rehash():
+            user.password_hash = hash_password(data['password'])
+            User.objects(id=user.id).update_one(set__password_hash=user.password_hash)
+            invalidate_user(user.id)
+    except HasherBusy as e:
+        return jsonify({'error': e.message}), e.status_code, {'Retry-After': '1'}
     
     # Create tokens
-    access_token = create_access_token(identity=str(user.id))
-    refresh_token = create_refresh_token(identity=str(user.id))
+    access_token, refresh_token = issue_tokens(user)
     
     return jsonify({
         'message': 'Login successful',
@@ -187,10 +207,15 @@ def refresh():
             access_token:
               type: string
       401:
-        description: Invalid or expired refresh token
+        description: Invalid, expired or revoked refresh token
     """
-    current_user_id = get_jwt_identity()
-    access_token = create_access_token(identity=current_user_id)
+    # Refresh tokens issued before a password or role change never get here
+    user = resolve_user(get_jwt_identity())
+    if not user:
+        return jsonify({'error': 'Token has been revoked'}), 401
+    
+    # New access token carries the user's current role and name
+    access_token, _ = issue_tokens(user, refresh=False)
     
     return jsonify({
         'access_token': access_token
@@ -219,8 +244,7 @@ def get_current_user():
       404:
         description: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
+    user = resolve_user(get_jwt_identity())
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
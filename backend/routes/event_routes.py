@@ -3,11 +3,19 @@ from models import Event
 from datetime import datetime
 from flask_jwt_extended import jwt_required
 from mongoengine.errors import ValidationError, DoesNotExist
+from utils.pagination import paginate
+from utils.search import search_events
+from utils.suggest import index as suggest_index
+from utils.response_cache import cached, list_key
+from utils.versions import conditional
+from utils.serializers import event_dict, stored_fields, EVENT_FIELDS
 
 event_bp = Blueprint('events', __name__, url_prefix='/api/events')
 
 
 @event_bp.route('/', methods=['GET'])
+@conditional(lambda: ('events',), window=60)
+@cached(lambda: list_key('events:list'))
 def get_events():
     """Get all events with optional filtering
     ---
@@ -22,7 +30,7 @@ def get_events():
       - name: search
         in: query
         type: string
-        description: Search in title, description, and location
+        description: Full-text search in title, location and description; results are ordered by relevance and paginated by page
         required: false
       - name: upcoming
         in: query
@@ -30,18 +38,29 @@ def get_events():
         description: Filter only upcoming events
         default: false
         required: false
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor from next_cursor of the previous page
+        required: false
       - name: page
         in: query
         type: integer
-        description: Page number for pagination
+        description: Page number (legacy, slower on deep pages; prefer cursor)
         default: 1
         required: false
       - name: per_page
         in: query
         type: integer
-        description: Items per page
+        description: Items per page (max 100)
         default: 20
         required: false
+      - name: include_total
+        in: query
+        type: boolean
+        description: Also count all matching items (adds a count query)
+        default: false
+        required: false
     responses:
       200:
         description: List of events
@@ -52,19 +71,28 @@ def get_events():
               type: array
               items:
                 type: object
+            next_cursor:
+              type: string
+              description: Cursor for the next page, null on the last page
             total:
               type: integer
+              description: Only with include_total=true
             pages:
               type: integer
+              description: Only with include_total=true
             current_page:
               type: integer
+              description: Only when paginating by page
+            next_page:
+              type: integer
+              description: Next page number for search results, null on the last page
+      304:
+        description: Not modified since the ETag sent in If-None-Match
     """
     # Query parameters
     category = request.args.get('category')
     search = request.args.get('search')
     upcoming_only = request.args.get('upcoming', 'false').lower() == 'true'
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
     
     # Build query using MongoEngine Q objects
     queryset = Event.objects
@@ -73,34 +101,71 @@ def get_events():
     if category:
         queryset = queryset.filter(category=category)
     
-    # Filter by search term
-    if search:
-        from mongoengine import Q
-        queryset = queryset.filter(
-            Q(title__icontains=search) |
-            Q(description__icontains=search) |
-            Q(location__icontains=search)
-        )
-    
     # Filter upcoming events
     if upcoming_only:
         queryset = queryset.filter(date__gt=datetime.now())
     
-    # Apply ordering
-    queryset = queryset.order_by('date')
-    total = queryset.count()
-    events = queryset.skip((page - 1) * per_page).limit(per_page)
-    pages = (total + per_page - 1) // per_page  # Calculate total pages
+    # Search results are ordered by relevance, everything else by date
+    if search:
+        events, meta = search_events(queryset, search)
+        events = [event.to_dict() for event in events]
+    else:
+        try:
+            events, meta = paginate(queryset.only(*stored_fields(EVENT_FIELDS)).as_pymongo(), 'date')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        events = [event_dict(event) for event in events]
     
     return jsonify({
-        'events': [event.to_dict() for event in events],
-        'total': total,
-        'pages': pages,
-        'current_page': page
+        'events': events,
+        **meta
     }), 200
 
 
+@event_bp.route('/suggest', methods=['GET'])
+def suggest_events():
+    """Autocomplete event titles and locations by prefix
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Text typed so far; matches the start of any word
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of suggestions (max 25)
+        default: 10
+        required: false
+    responses:
+      200:
+        description: Matching titles and locations
+        schema:
+          type: object
+          properties:
+            suggestions:
+              type: array
+              items:
+                type: object
+                properties:
+                  text:
+                    type: string
+                  type:
+                    type: string
+                    enum: [title, location]
+    """
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 25)
+    
+    return jsonify({'suggestions': suggest_index.suggest(prefix, limit)}), 200
+
+
 @event_bp.route('/<event_id>', methods=['GET'])
+@conditional(lambda event_id: (f'event:{event_id}',))
+@cached(lambda event_id: f'events:detail:{event_id}')
 def get_event(event_id):
     """Get single event by ID
     ---
@@ -117,6 +182,8 @@ def get_event(event_id):
         description: Event details
         schema:
           type: object
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       400:
         description: Invalid event ID
       404:
@@ -394,6 +461,7 @@ def delete_event(event_id):
 
 
 @event_bp.route('/categories', methods=['GET'])
+@cached(lambda: list_key('events:categories'))
 def get_categories():
     """Get all unique event categories
     ---
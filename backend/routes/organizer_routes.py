@@ -1,35 +1,56 @@
-from flask import Blueprint, request, jsonify
-from models import Event, Ticket, User
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from models import Event
 from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from mongoengine.errors import ValidationError, DoesNotExist
-from bson import ObjectId
 from functools import wraps
+from utils.ticket_tokens import parse_token
+from utils.gate_bundle import build_bundle
+from utils.scan_sync import apply_scans
+from utils.ticket_states import transition, TransitionError
+from utils.pagination import paginate
+from utils.versions import conditional, organizer_keys
+from utils.organizer_stats import compute_stats
+from utils.auth_utils import current_token_user, AuthError
+from utils.rate_limit import rate_limited
+from utils.serializers import event_dict, stored_fields, EVENT_FIELDS
+from utils.attendees import event_tickets, attendee_rows, iter_attendees, csv_chunks, ndjson_chunks
+from utils.sales_rollup import series as sales_series, parse_utc, GRANULARITIES
+from mongoengine import Q
 
 organizer_bp = Blueprint('organizer', __name__, url_prefix='/api/organizer')
 
+# Attendee export encoders: format -> (chunk generator, mimetype)
+EXPORT_FORMATS = {
+    'csv': (csv_chunks, 'text/csv'),
+    'ndjson': (ndjson_chunks, 'application/x-ndjson')
+}
+
 
 def organizer_required(fn):
-    """Decorator to check if user is an organizer"""
+    """Decorator to check if user is an organizer.
+
+    Authorizes from the token's role claim and passes the caller to the
+    handler as `current_user` (a TokenUser), so handlers need no User query.
+    """
     @wraps(fn)
     @jwt_required()
     def wrapper(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.objects(id=current_user_id).first()
+        try:
+            current_user = current_token_user()
+        except AuthError as e:
+            return jsonify({'error': e.message}), e.status_code
         
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        if user.role not in ['organizer', 'admin']:
+        if current_user.role not in ['organizer', 'admin']:
             return jsonify({'error': 'Organizer access required'}), 403
         
-        return fn(*args, **kwargs)
+        return fn(*args, current_user=current_user, **kwargs)
     return wrapper
 
 
 @organizer_bp.route('/events', methods=['GET'])
 @organizer_required
-def get_organizer_events():
+def get_organizer_events(current_user):
     """Get all events created by the current organizer
     ---
     tags:
@@ -37,18 +58,29 @@ def get_organizer_events():
     security:
       - Bearer: []
     parameters:
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor from next_cursor of the previous page
+        required: false
       - name: page
         in: query
         type: integer
-        description: Page number for pagination
+        description: Page number (legacy, slower on deep pages; prefer cursor)
         default: 1
         required: false
       - name: per_page
         in: query
         type: integer
-        description: Items per page
+        description: Items per page (max 100)
         default: 20
         required: false
+      - name: include_total
+        in: query
+        type: boolean
+        description: Also count all matching items (adds a count query)
+        default: false
+        required: false
     responses:
       200:
         description: List of organizer's events
@@ -59,12 +91,18 @@ def get_organizer_events():
               type: array
               items:
                 type: object
+            next_cursor:
+              type: string
+              description: Cursor for the next page, null on the last page
             total:
               type: integer
+              description: Only with include_total=true
             pages:
               type: integer
+              description: Only with include_total=true
             current_page:
               type: integer
+              description: Only when paginating by page
       401:
         description: Unauthorized
       403:
@@ -72,30 +110,25 @@ def get_organizer_events():
       404:
         description: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
-    # Query parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
-    
     # Get events for this organizer
-    queryset = Event.objects(organizer_id=user).order_by('-created_at')
-    total = queryset.count()
-    events = queryset.skip((page - 1) * per_page).limit(per_page)
-    pages = (total + per_page - 1) // per_page
+    try:
+        events, meta = paginate(
+            Event.objects(organizer_id=current_user.id).only(*stored_fields(EVENT_FIELDS), 'created_at').as_pymongo(),
+            'created_at',
+            descending=True
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'events': [event.to_dict() for event in events],
-        'total': total,
-        'pages': pages,
-        'current_page': page
+        'events': [event_dict(event) for event in events],
+        **meta
     }), 200
 
 
 @organizer_bp.route('/events', methods=['POST'])
 @organizer_required
-def create_event():
+def create_event(current_user):
     """Create a new event
     ---
     tags:
@@ -169,9 +202,6 @@ def create_event():
       500:
         description: Internal server error
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
     data = request.get_json()
     
     # Validate required fields
@@ -193,8 +223,8 @@ def create_event():
             price=float(data['price']),
             image_url=data.get('imageUrl', 'https://picsum.photos/800/450'),
             available_tickets=int(data['availableTickets']),
-            organizer_name=user.name,
-            organizer_id=user
+            organizer_name=current_user.name,
+            organizer_id=current_user.id
         )
         event.save()
         
@@ -213,7 +243,7 @@ def create_event():
 
 @organizer_bp.route('/events/<event_id>', methods=['PUT'])
 @organizer_required
-def update_event(event_id):
+def update_event(event_id, current_user):
     """Update an event
     ---
     tags:
@@ -270,9 +300,6 @@ def update_event(event_id):
       500:
         description: Internal server error
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
     try:
         event = Event.objects(id=event_id).first()
         
@@ -280,7 +307,7 @@ def update_event(event_id):
             return jsonify({'error': 'Event not found'}), 404
         
         # Check if user is the organizer
-        if event.organizer_id.id != user.id and user.role != 'admin':
+        if event.ref_id('organizer_id') != current_user.id and current_user.role != 'admin':
             return jsonify({'error': 'Unauthorized'}), 403
         
         data = request.get_json()
@@ -320,7 +347,7 @@ def update_event(event_id):
 
 @organizer_bp.route('/events/<event_id>', methods=['DELETE'])
 @organizer_required
-def delete_event(event_id):
+def delete_event(event_id, current_user):
     """Delete an event
     ---
     tags:
@@ -350,9 +377,6 @@ def delete_event(event_id):
       500:
         description: Internal server error
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
     try:
         event = Event.objects(id=event_id).first()
         
@@ -360,7 +384,7 @@ def delete_event(event_id):
             return jsonify({'error': 'Event not found'}), 404
         
         # Check if user is the organizer
-        if event.organizer_id.id != user.id and user.role != 'admin':
+        if event.ref_id('organizer_id') != current_user.id and current_user.role != 'admin':
             return jsonify({'error': 'Unauthorized'}), 403
         
         event.delete()
@@ -377,8 +401,8 @@ def delete_event(event_id):
 
 @organizer_bp.route('/events/<event_id>/attendees', methods=['GET'])
 @organizer_required
-def get_event_attendees(event_id):
-    """Get all attendees (ticket holders) for an event
+def get_event_attendees(event_id, current_user):
+    """Get attendees (ticket holders) for an event, newest purchase first
     ---
     tags:
       - Organizer
@@ -390,9 +414,26 @@ def get_event_attendees(event_id):
         type: string
         required: true
         description: Event ID
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor from the previous page's next_cursor
+        required: false
+      - name: per_page
+        in: query
+        type: integer
+        description: Items per page (max 100)
+        default: 20
+        required: false
+      - name: include_total
+        in: query
+        type: boolean
+        description: Also count all attendees (adds a count query)
+        default: false
+        required: false
     responses:
       200:
-        description: List of attendees
+        description: One page of attendees
         schema:
           type: object
           properties:
@@ -420,12 +461,18 @@ def get_event_attendees(event_id):
                     type: string
                   status:
                     type: string
-                  purchaseDate:
+                  seatNumber:
                     type: string
-                  qrCode:
+                  purchaseDate:
                     type: string
             total:
               type: integer
+              description: Number of attendees across all pages, only with include_total=true
+            next_cursor:
+              type: string
+              description: Cursor for the next page, null on the last page
+      400:
+        description: Invalid cursor
       401:
         description: Unauthorized
       403:
@@ -435,34 +482,23 @@ def get_event_attendees(event_id):
       500:
         description: Internal server error
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
     try:
-        event = Event.objects(id=event_id).first()
+        event = Event.objects(id=event_id).only('id', 'title', 'date', 'organizer_id').first()
         
         if not event:
             return jsonify({'error': 'Event not found'}), 404
         
         # Check if user is the organizer
-        if event.organizer_id and event.organizer_id.id != user.id and user.role != 'admin':
+        organizer_id = event.ref_id('organizer_id')
+        if organizer_id and organizer_id != current_user.id and current_user.role != 'admin':
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get all tickets for this event
-        tickets = Ticket.objects(event_id=event).order_by('-purchase_date')
-        
-        attendees = []
-        for ticket in tickets:
-            attendee_data = {
-                'ticketId': str(ticket.id),
-                'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
-                'userEmail': ticket.user_id.email if ticket.user_id else 'Unknown',
-                'userPhone': ticket.user_id.phone if ticket.user_id else None,
-                'status': ticket.status,
-                'purchaseDate': ticket.purchase_date.isoformat() if ticket.purchase_date else None,
-                'qrCode': ticket.qr_code
-            }
-            attendees.append(attendee_data)
+        # One page of tickets, then one batched lookup of their holders
+        tickets = event_tickets(event.id)
+        try:
+            page, meta = paginate(tickets, 'purchase_date', descending=True)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify({
             'event': {
@@ -470,8 +506,371 @@ def get_event_attendees(event_id):
                 'title': event.title,
                 'date': event.date.isoformat()
             },
-            'attendees': attendees,
-            'total': len(attendees)
+            'attendees': attendee_rows(page),
+            **meta
+        }), 200
+    
+    except DoesNotExist:
+        return jsonify({'error': 'Event not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@organizer_bp.route('/events/<event_id>/attendees/export', methods=['GET'])
+@organizer_required
+def export_event_attendees(event_id, current_user):
+    """Download every attendee of an event as CSV or NDJSON
+    ---
+    tags:
+      - Organizer
+    security:
+      - Bearer: []
+    produces:
+      - text/csv
+      - application/x-ndjson
+    parameters:
+      - name: event_id
+        in: path
+        type: string
+        required: true
+        description: Event ID
+      - name: format
+        in: query
+        type: string
+        enum: [csv, ndjson]
+        default: csv
+        required: false
+    responses:
+      200:
+        description: Streamed door list, newest purchase first, one row per ticket
+      400:
+        description: Unsupported format
+      401:
+        description: Unauthorized
+      403:
+        description: Not the event organizer
+      404:
+        description: Event not found
+      500:
+        description: Internal server error
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    try:
+        event = Event.objects(id=event_id).only('id', 'organizer_id').first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        
+        # Check if user is the organizer
+        organizer_id = event.ref_id('organizer_id')
+        if organizer_id and organizer_id != current_user.id and current_user.role != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 403
+    
+    except ValidationError:
+        return jsonify({'error': 'Event not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Rows are produced while the response is sent, never held all at once
+    encode, mimetype = EXPORT_FORMATS[export_format]
+    response = Response(stream_with_context(encode(iter_attendees(event.id))), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=attendees-{event.id}.{export_format}'
+    return response
+
+
+@organizer_bp.route('/events/<event_id>/validation-bundle', methods=['GET'])
+@organizer_required
+def get_validation_bundle(event_id, current_user):
+    """Export a signed offline validation bundle for scanner devices
+    ---
+    tags:
+      - Organizer
+    security:
+      - Bearer: []
+    parameters:
+      - name: event_id
+        in: path
+        type: string
+        required: true
+        description: Event ID
+    responses:
+      200:
+        description: Sorted digests of every active ticket, packed and signed
+        schema:
+          type: object
+          properties:
+            eventId:
+              type: string
+            generatedAt:
+              type: string
+            digestBytes:
+              type: integer
+            count:
+              type: integer
+            digests:
+              type: string
+              description: Base64 of the sorted, concatenated raw digests
+            signature:
+              type: string
+              description: HMAC-SHA256 of eventId|generatedAt|digests
+      401:
+        description: Unauthorized
+      403:
+        description: Not the event organizer
+      404:
+        description: Event not found
+      500:
+        description: Internal server error
+    """
+    try:
+        event = Event.objects(id=event_id).first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        
+        # Check if user is the organizer
+        organizer_id = event.ref_id('organizer_id')
+        if organizer_id and organizer_id != current_user.id and current_user.role != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        return jsonify(build_bundle(event.id)), 200
+    
+    except DoesNotExist:
+        return jsonify({'error': 'Event not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@organizer_bp.route('/events/<event_id>/sales', methods=['GET'])
+@organizer_required
+def get_event_sales(event_id, current_user):
+    """Get ticket sales of an event over time
+    ---
+    tags:
+      - Organizer
+    security:
+      - Bearer: []
+    parameters:
+      - name: event_id
+        in: path
+        type: string
+        required: true
+        description: Event ID
+      - name: granularity
+        in: query
+        type: string
+        enum: [hour, day]
+        default: hour
+        description: Bucket size (UTC)
+        required: false
+      - name: from
+        in: query
+        type: string
+        description: ISO timestamp of the first bucket to include
+        required: false
+      - name: to
+        in: query
+        type: string
+        description: ISO timestamp to stop before
+        required: false
+    responses:
+      200:
+        description: Sales per bucket, oldest first; buckets without activity are omitted
+        schema:
+          type: object
+          properties:
+            eventId:
+              type: string
+            granularity:
+              type: string
+            buckets:
+              type: array
+              items:
+                type: object
+                properties:
+                  start:
+                    type: string
+                  sold:
+                    type: integer
+                  revenue:
+                    type: number
+                  cancelled:
+                    type: integer
+                  refunded:
+                    type: number
+      400:
+        description: Invalid granularity or timestamp
+      401:
+        description: Unauthorized
+      403:
+        description: Not the event organizer
+      404:
+        description: Event not found
+      500:
+        description: Internal server error
+    """
+    granularity = request.args.get('granularity', 'hour')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': f"granularity must be one of: {', '.join(GRANULARITIES)}"}), 400
+    
+    try:
+        bounds = [
+            parse_utc(request.args[name])
+            if request.args.get(name) else None
+            for name in ('from', 'to')
+        ]
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO timestamps'}), 400
+    
+    try:
+        event = Event.objects(id=event_id).only('id', 'organizer_id').first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        
+        # Check if user is the organizer
+        organizer_id = event.ref_id('organizer_id')
+        if organizer_id and organizer_id != current_user.id and current_user.role != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        return jsonify({
+            'eventId': str(event.id),
+            'granularity': granularity,
+            'buckets': sales_series(event.id, granularity, *bounds)
+        }), 200
+    
+    except ValidationError:
+        return jsonify({'error': 'Event not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@organizer_bp.route('/events/<event_id>/scans', methods=['POST'])
+@organizer_required
+def sync_scans(event_id, current_user):
+    """Apply a batch of gate scans, marking the scanned tickets as used
+    ---
+    tags:
+      - Organizer
+    security:
+      - Bearer: []
+    parameters:
+      - name: event_id
+        in: path
+        type: string
+        required: true
+        description: Event ID
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - scans
+          properties:
+            scans:
+              type: array
+              items:
+                type: object
+                properties:
+                  ticketId:
+                    type: string
+                    description: Ticket ID (either ticketId or digest is required)
+                  digest:
+                    type: string
+                    description: Ticket digest from the validation bundle
+                  scannerId:
+                    type: string
+                    description: Gate device that made the scan
+                  scannedAt:
+                    type: string
+                    format: date-time
+    responses:
+      200:
+        description: Per-scan results; re-uploading the same scans is a no-op
+        schema:
+          type: object
+          properties:
+            received:
+              type: integer
+            used:
+              type: integer
+            duplicates:
+              type: integer
+            conflicts:
+              type: integer
+            notFound:
+              type: integer
+            invalid:
+              type: integer
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  ticketId:
+                    type: string
+                  digest:
+                    type: string
+                  result:
+                    type: string
+                    enum: [used, duplicate, conflict, not_found, invalid]
+      400:
+        description: Scans are required or the batch is too large
+      401:
+        description: Unauthorized
+      403:
+        description: Not the event organizer
+      404:
+        description: Event not found
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    
+    scans = data.get('scans')
+    if not isinstance(scans, list) or not scans:
+        return jsonify({'error': 'Scans are required'}), 400
+    
+    max_scans = current_app.config['MAX_SCANS_PER_SYNC']
+    if len(scans) > max_scans:
+        return jsonify({'error': f'At most {max_scans} scans per request'}), 400
+    
+    try:
+        event = Event.objects(id=event_id).first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        
+        # Check if user is the organizer
+        organizer_id = event.ref_id('organizer_id')
+        if organizer_id and organizer_id != current_user.id and current_user.role != 'admin':
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        scans = [scan if isinstance(scan, dict) else {} for scan in scans]
+        results = apply_scans(event.id, scans)
+        
+        return jsonify({
+            'received': len(scans),
+            'used': results.count('used'),
+            'duplicates': results.count('duplicate'),
+            'conflicts': results.count('conflict'),
+            'notFound': results.count('not_found'),
+            'invalid': results.count('invalid'),
+            'results': [
+                {
+                    'index': index,
+                    'ticketId': scan.get('ticketId'),
+                    'digest': scan.get('digest'),
+                    'result': result
+                }
+                for index, (scan, result) in enumerate(zip(scans, results))
+            ]
         }), 200
     
     except DoesNotExist:
@@ -482,7 +881,8 @@ def get_event_attendees(event_id):
 
 @organizer_bp.route('/validate-ticket', methods=['POST'])
 @organizer_required
-def validate_ticket():
+@rate_limited('validate')
+def validate_ticket(current_user):
     """Validate a ticket by QR code
     ---
     tags:
@@ -500,8 +900,12 @@ def validate_ticket():
           properties:
             qrCode:
               type: string
-              description: QR code data from ticket
-              example: "eyJldmVudElkIjogIjUwN2YxZjc3YmNmODZjZDc5OTQzOTAxMSIsIC..."
+              description: Signed ticket token read from the QR code
+              example: "ZQx3k9r2AAAAAAAAAABlDHeTavk3AAAAAAAAAAC7xq1l0tR0mPw"
+            eventId:
+              type: string
+              description: Event being admitted; tickets for other events are rejected (optional)
+              example: "507f1f77bcf86cd799439011"
     responses:
       200:
         description: Ticket validation result
@@ -532,13 +936,15 @@ def validate_ticket():
                 status:
                   type: string
       400:
-        description: QR code is required
+        description: QR code is required or its signature is invalid
       401:
         description: Unauthorized
       403:
         description: Organizer access required
       404:
         description: Ticket not found
+      429:
+        description: Too many validations, retry after Retry-After seconds
       500:
         description: Internal server error
     """
@@ -547,58 +953,29 @@ def validate_ticket():
     if not data.get('qrCode'):
         return jsonify({'error': 'QR code is required'}), 400
     
+    # Verify the signed token before touching the database
+    parsed = parse_token(data['qrCode'])
+    if not parsed:
+        return jsonify({
+            'valid': False,
+            'message': 'Invalid ticket code'
+        }), 400
+    
+    ticket_id, event_id = parsed
+    if data.get('eventId') and data['eventId'] != str(event_id):
+        return jsonify({
+            'valid': False,
+            'message': 'Ticket is for a different event'
+        }), 200
+    
     try:
-        # Find ticket by QR code
-        ticket = Ticket.objects(qr_code=data['qrCode']).first()
-        
-        if not ticket:
-            return jsonify({
-                'valid': False,
-                'message': 'Ticket not found'
-            }), 404
-        
-        # Check ticket status
-        if ticket.status == 'used':
-            return jsonify({
-                'valid': False,
-                'message': 'Ticket already used',
-                'ticket': {
-                    'id': str(ticket.id),
-                    'eventTitle': ticket.event_title,
-                    'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
-                    'status': ticket.status
-                }
-            }), 200
-        
-        if ticket.status == 'cancelled':
-            return jsonify({
-                'valid': False,
-                'message': 'Ticket cancelled',
-                'ticket': {
-                    'id': str(ticket.id),
-                    'eventTitle': ticket.event_title,
-                    'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
-                    'status': ticket.status
-                }
-            }), 200
-        
-        # Check if event has passed
-        if ticket.event_date and ticket.event_date < datetime.now():
-            return jsonify({
-                'valid': False,
-                'message': 'Event has passed',
-                'ticket': {
-                    'id': str(ticket.id),
-                    'eventTitle': ticket.event_title,
-                    'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
-                    'eventDate': ticket.event_date.isoformat(),
-                    'status': ticket.status
-                }
-            }), 200
-        
-        # Ticket is valid - mark as used
-        ticket.status = 'used'
-        ticket.save()
+        # Genuine tickets are admitted with a single atomic active -> used flip
+        ticket = transition(
+            ticket_id, 'used',
+            condition=Q(event_date__gte=datetime.now()),
+            condition_error='Event has passed',
+            set__used_at=datetime.utcnow()
+        )
         
         return jsonify({
             'valid': True,
@@ -615,19 +992,59 @@ def validate_ticket():
             }
         }), 200
     
+    except TransitionError as e:
+        ticket = e.ticket
+        
+        if not ticket:
+            return jsonify({
+                'valid': False,
+                'message': 'Ticket not found'
+            }), 404
+        
+        ticket_data = {
+            'id': str(ticket.id),
+            'eventTitle': ticket.event_title,
+            'userName': ticket.user_id.name if ticket.user_id else 'Unknown',
+            'status': ticket.status
+        }
+        
+        # Check ticket status
+        if ticket.status == 'used':
+            message = 'Ticket already used'
+        elif ticket.status != 'active':
+            message = f'Ticket {ticket.status}'
+        else:
+            # Active ticket rejected by the condition: the event has passed
+            message = e.message
+            ticket_data['eventDate'] = ticket.event_date.isoformat()
+        
+        return jsonify({
+            'valid': False,
+            'message': message,
+            'ticket': ticket_data
+        }), 200
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @organizer_bp.route('/stats', methods=['GET'])
 @organizer_required
-def get_organizer_stats():
+@conditional(lambda: organizer_keys(get_jwt_identity()), private=True, window=60)
+def get_organizer_stats(current_user):
     """Get statistics for organizer's events
     ---
     tags:
       - Organizer
     security:
       - Bearer: []
+    parameters:
+      - name: include
+        in: query
+        type: string
+        enum: [events]
+        description: Set to 'events' to add a per-event breakdown
+        required: false
     responses:
       200:
         description: Organizer statistics
@@ -642,10 +1059,21 @@ def get_organizer_stats():
               description: Number of upcoming events
             totalTicketsSold:
               type: integer
-              description: Total tickets sold across all events
+              description: Tickets sold across all events (pending holds excluded)
             totalRevenue:
               type: number
               description: Total revenue from ticket sales
+            cancelledTickets:
+              type: integer
+              description: Tickets cancelled by their holders
+            ticketsByStatus:
+              type: object
+              description: Sold ticket count per status (active, used, expired)
+            events:
+              type: array
+              description: Only with include=events. Per-event eventId, title, ticketsSold, revenue, cancelledTickets and ticketsByStatus
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       401:
         description: Unauthorized
       403:
@@ -653,29 +1081,9 @@ def get_organizer_stats():
       500:
         description: Internal server error
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
-    
     try:
-        # Get all events for this organizer
-        events = Event.objects(organizer_id=user)
-        
-        total_events = events.count()
-        upcoming_events = events.filter(date__gt=datetime.now()).count()
-        
-        # Get all tickets for organizer's events
-        event_ids = [event for event in events]
-        tickets = Ticket.objects(event_id__in=event_ids)
-        
-        total_tickets_sold = tickets.count()
-        total_revenue = sum([float(ticket.price) if ticket.price else 0.0 for ticket in tickets])
-        
-        return jsonify({
-            'totalEvents': total_events,
-            'upcomingEvents': upcoming_events,
-            'totalTicketsSold': total_tickets_sold,
-            'totalRevenue': total_revenue
-        }), 200
+        include_events = request.args.get('include') == 'events'
+        return jsonify(compute_stats(current_user.id, include_events)), 200
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
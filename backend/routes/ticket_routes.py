@@ -1,17 +1,27 @@
-from flask import Blueprint, request, jsonify
-from models import Ticket, Event, User
+from flask import Blueprint, Response, request, jsonify, current_app
+from models import Ticket
 from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from utils.qr_generator import generate_qr_code
+from utils.inventory import sell_ticket, sell_tickets, release, InventoryError
+from utils.reservations import create_hold, confirm_hold
+from utils.ticket_states import transition, TransitionError
+from utils.qr_generator import render_png
+from utils.pagination import paginate
+from utils.versions import conditional, organizer_keys, ticket_keys
+from utils.sales_counters import after_write, organizer_of, record_cancellation
+from utils.users import resolve_user
+from utils.rate_limit import rate_limited
+from utils.serializers import ticket_dict, stored_fields, TICKET_FIELDS
 from mongoengine.errors import ValidationError, DoesNotExist
 from bson import ObjectId
-import json
+import hashlib
 
 ticket_bp = Blueprint('tickets', __name__, url_prefix='/api/tickets')
 
 
 @ticket_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional(lambda: (f'tickets:user:{get_jwt_identity()}',), private=True)
 def get_user_tickets():
     """Get all tickets for current user
     ---
@@ -26,18 +36,29 @@ def get_user_tickets():
         description: Filter by ticket status
         required: false
         enum: [active, used, expired, pending]
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor from next_cursor of the previous page
+        required: false
       - name: page
         in: query
         type: integer
-        description: Page number for pagination
+        description: Page number (legacy, slower on deep pages; prefer cursor)
         default: 1
         required: false
       - name: per_page
         in: query
         type: integer
-        description: Items per page
+        description: Items per page (max 100)
         default: 20
         required: false
+      - name: include_total
+        in: query
+        type: boolean
+        description: Also count all matching items (adds a count query)
+        default: false
+        required: false
     responses:
       200:
         description: List of user tickets
@@ -48,12 +69,20 @@ def get_user_tickets():
               type: array
               items:
                 type: object
+            next_cursor:
+              type: string
+              description: Cursor for the next page, null on the last page
             total:
               type: integer
+              description: Only with include_total=true
             pages:
               type: integer
+              description: Only with include_total=true
             current_page:
               type: integer
+              description: Only when paginating by page
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       401:
         description: Unauthorized
     """
@@ -61,8 +90,6 @@ def get_user_tickets():
     
     # Query parameters
     status = request.args.get('status')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
     
     # Build query - convert user_id string to ObjectId
     query = {'user_id': ObjectId(current_user_id)}
@@ -72,16 +99,18 @@ def get_user_tickets():
         query['status'] = status
     
     # Query with pagination
-    queryset = Ticket.objects(__raw__=query).order_by('-event_date')
-    total = queryset.count()
-    tickets = queryset.skip((page - 1) * per_page).limit(per_page)
-    pages = (total + per_page - 1) // per_page  # Calculate total pages
+    try:
+        tickets, meta = paginate(
+            Ticket.objects(__raw__=query).only(*stored_fields(TICKET_FIELDS)).as_pymongo(),
+            'event_date',
+            descending=True
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'tickets': [ticket.to_dict() for ticket in tickets],
-        'total': total,
-        'pages': pages,
-        'current_page': page
+        'tickets': [ticket_dict(ticket) for ticket in tickets],
+        **meta
     }), 200
 
 
@@ -131,8 +160,71 @@ def get_ticket(ticket_id):
         return jsonify({'error': 'Invalid ticket ID'}), 400
 
 
+@ticket_bp.route('/<ticket_id>/qr.png', methods=['GET'])
+@jwt_required()
+def get_ticket_qr(ticket_id):
+    """Get a ticket's QR code as a PNG image
+    ---
+    tags:
+      - Tickets
+    security:
+      - Bearer: []
+    produces:
+      - image/png
+    parameters:
+      - name: ticket_id
+        in: path
+        type: string
+        required: true
+        description: Ticket ID
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response
+    responses:
+      200:
+        description: QR code PNG
+      304:
+        description: Not modified
+      400:
+        description: Invalid ticket ID
+      401:
+        description: Unauthorized
+      403:
+        description: Ticket does not belong to user
+      404:
+        description: Ticket not found
+    """
+    current_user_id = get_jwt_identity()
+    
+    try:
+        ticket = Ticket.objects(id=ticket_id).only('user_id', 'qr_code').first()
+    except Exception:
+        return jsonify({'error': 'Invalid ticket ID'}), 400
+    
+    if not ticket:
+        return jsonify({'error': 'Ticket not found'}), 404
+    
+    # Check if ticket belongs to user
+    if str(ticket.user_id.id) != current_user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    # The image is a pure function of the token, so the token hash is a strong ETag
+    etag = hashlib.sha1(ticket.qr_code.encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(render_png(ticket.qr_code), mimetype='image/png')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f"private, max-age={current_app.config['QR_CACHE_TTL']}"
+    return response
+
+
 @ticket_bp.route('/purchase', methods=['POST'])
 @jwt_required()
+@rate_limited('purchase')
 def purchase_ticket():
     """Purchase a ticket for an event
     ---
@@ -173,6 +265,8 @@ def purchase_ticket():
         description: Unauthorized
       404:
         description: Event or user not found
+      429:
+        description: Too many purchase attempts, retry after Retry-After seconds
       500:
         description: Internal server error
     """
@@ -184,56 +278,221 @@ def purchase_ticket():
         return jsonify({'error': 'Event ID is required'}), 400
     
     try:
-        # Get event
-        event = Event.objects(id=data['eventId']).first()
-        if not event:
-            return jsonify({'error': 'Event not found'}), 404
-        
-        # Check if tickets available
-        if event.available_tickets <= 0:
-            return jsonify({'error': 'No tickets available'}), 400
+        # Get user
+        user = resolve_user(current_user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
         
-        # Check if event is in the future
-        if event.date < datetime.utcnow():
-            return jsonify({'error': 'Cannot purchase tickets for past events'}), 400
+        # Reserve inventory and create the ticket in one step
+        ticket = sell_ticket(data['eventId'], user, seat_number=data.get('seatNumber'))
         
+        return jsonify({
+            'message': 'Ticket purchased successfully',
+            'ticket': ticket.to_dict()
+        }), 201
+    
+    except InventoryError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@ticket_bp.route('/purchase/batch', methods=['POST'])
+@jwt_required()
+@rate_limited('purchase')
+def purchase_tickets_batch():
+    """Purchase several tickets for one event in a single order
+    ---
+    tags:
+      - Tickets
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - eventId
+          properties:
+            eventId:
+              type: string
+              description: Event ID to purchase tickets for
+              example: "507f1f77bcf86cd799439011"
+            quantity:
+              type: integer
+              description: Number of tickets (ignored when seatNumbers is given)
+              example: 4
+            seatNumbers:
+              type: array
+              items:
+                type: string
+              description: One seat number per ticket (optional)
+              example: ["A15", "A16"]
+    responses:
+      201:
+        description: Tickets purchased; results lists the outcome per ticket
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+            purchased:
+              type: integer
+            failed:
+              type: integer
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  seatNumber:
+                    type: string
+                  success:
+                    type: boolean
+                  ticket:
+                    type: object
+                  error:
+                    type: string
+      400:
+        description: Invalid quantity, not enough tickets available, or past event
+      401:
+        description: Unauthorized
+      404:
+        description: Event or user not found
+      429:
+        description: Too many purchase attempts, retry after Retry-After seconds
+      500:
+        description: Internal server error
+    """
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    # Validate required fields
+    if not data.get('eventId'):
+        return jsonify({'error': 'Event ID is required'}), 400
+    
+    seat_numbers = data.get('seatNumbers')
+    if seat_numbers is None:
+        try:
+            seat_numbers = [None] * int(data.get('quantity', 1))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Quantity must be an integer'}), 400
+    
+    max_tickets = current_app.config['MAX_TICKETS_PER_ORDER']
+    if not isinstance(seat_numbers, list) or not 0 < len(seat_numbers) <= max_tickets:
+        return jsonify({'error': f'Quantity must be between 1 and {max_tickets}'}), 400
+    
+    try:
         # Get user
-        user = User.objects(id=current_user_id).first()
+        user = resolve_user(current_user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Generate QR code data
-        ticket_data = {
-            'eventId': str(event.id),
-            'userId': current_user_id,
-            'eventTitle': event.title,
-            'eventDate': event.date.isoformat()
-        }
-        qr_code = generate_qr_code(json.dumps(ticket_data))
+        results = sell_tickets(data['eventId'], user, seat_numbers)
+        purchased = sum(1 for _, ticket, _ in results if ticket)
         
-        # Create ticket
-        ticket = Ticket(
-            event_id=event,
-            user_id=user,
-            event_title=event.title,
-            event_location=event.location,
-            event_date=event.date,
-            status='active',  # Set to active since payment is mocked
-            price=event.price,
+        return jsonify({
+            'message': f'{purchased} ticket(s) purchased successfully',
+            'purchased': purchased,
+            'failed': len(results) - purchased,
+            'results': [
+                {
+                    'seatNumber': seat_number,
+                    'success': ticket is not None,
+                    'ticket': ticket.to_dict() if ticket else None,
+                    'error': error
+                }
+                for seat_number, ticket, error in results
+            ]
+        }), 201
+    
+    except InventoryError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@ticket_bp.route('/reserve', methods=['POST'])
+@jwt_required()
+@rate_limited('purchase')
+def reserve_ticket():
+    """Hold a ticket for an event while checkout completes
+    ---
+    tags:
+      - Tickets
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - eventId
+          properties:
+            eventId:
+              type: string
+              description: Event ID to hold a ticket for
+              example: "507f1f77bcf86cd799439011"
+            seatNumber:
+              type: string
+              description: Seat number (optional)
+              example: "A15"
+    responses:
+      201:
+        description: Pending ticket created; activate it before expiresAt
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+            ticket:
+              type: object
+      400:
+        description: Event ID required, no tickets available, or past event
+      401:
+        description: Unauthorized
+      404:
+        description: Event or user not found
+      429:
+        description: Too many purchase attempts, retry after Retry-After seconds
+      500:
+        description: Internal server error
+    """
+    current_user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    # Validate required fields
+    if not data.get('eventId'):
+        return jsonify({'error': 'Event ID is required'}), 400
+    
+    try:
+        # Get user
+        user = resolve_user(current_user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        ticket = create_hold(
+            data['eventId'],
+            user,
             seat_number=data.get('seatNumber'),
-            qr_code=qr_code
+            hold_minutes=current_app.config['RESERVATION_HOLD_MINUTES']
         )
-        ticket.save()
-        
-        # Decrease available tickets
-        event.available_tickets -= 1
-        event.save()
         
         return jsonify({
-            'message': 'Ticket purchased successfully',
+            'message': 'Ticket reserved successfully',
             'ticket': ticket.to_dict()
         }), 201
     
+    except InventoryError as e:
+        return jsonify({'error': e.message}), e.status_code
     except ValidationError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
@@ -279,7 +538,7 @@ def update_ticket_status(ticket_id):
             ticket:
               type: object
       400:
-        description: Status required or invalid status
+        description: Status required, invalid status, transition not allowed, or reservation has expired
       401:
         description: Unauthorized
       403:
@@ -290,35 +549,30 @@ def update_ticket_status(ticket_id):
         description: Internal server error
     """
     current_user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    if not data.get('status'):
+        return jsonify({'error': 'Status is required'}), 400
+    
+    # Validate status
+    valid_statuses = ['active', 'used', 'expired', 'pending']
+    if data['status'] not in valid_statuses:
+        return jsonify({'error': 'Invalid status'}), 400
     
     try:
-        ticket = Ticket.objects(id=ticket_id).first()
-        
-        if not ticket:
-            return jsonify({'error': 'Ticket not found'}), 404
-        
-        # Check if ticket belongs to user
-        if str(ticket.user_id.id) != current_user_id:
-            return jsonify({'error': 'Unauthorized'}), 403
-        
-        data = request.get_json()
-        
-        if not data.get('status'):
-            return jsonify({'error': 'Status is required'}), 400
-        
-        # Validate status
-        valid_statuses = ['active', 'used', 'expired', 'pending']
-        if data['status'] not in valid_statuses:
-            return jsonify({'error': 'Invalid status'}), 400
-        
-        ticket.status = data['status']
-        ticket.save()
+        if data['status'] == 'active':
+            # Only a hold can become active: go through its expiry check
+            ticket = confirm_hold(ticket_id, ObjectId(current_user_id))
+        else:
+            ticket = transition(ticket_id, data['status'], user_id=ObjectId(current_user_id))
         
         return jsonify({
             'message': 'Ticket status updated successfully',
             'ticket': ticket.to_dict()
         }), 200
     
+    except TransitionError as e:
+        return jsonify({'error': e.message}), e.status_code
     except ValidationError as e:
         return jsonify({'error': str(e)}), 400
     except Exception as e:
@@ -351,7 +605,7 @@ def activate_ticket(ticket_id):
             ticket:
               type: object
       400:
-        description: Ticket is not pending
+        description: Ticket is not pending or reservation has expired
       401:
         description: Unauthorized
       403:
@@ -364,25 +618,15 @@ def activate_ticket(ticket_id):
     current_user_id = get_jwt_identity()
     
     try:
-        ticket = Ticket.objects(id=ticket_id).first()
-        
-        if not ticket:
-            return jsonify({'error': 'Ticket not found'}), 404
-        
-        if str(ticket.user_id.id) != current_user_id:
-            return jsonify({'error': 'Unauthorized'}), 403
-        
-        if ticket.status != 'pending':
-            return jsonify({'error': 'Ticket is not pending'}), 400
-        
-        ticket.status = 'active'
-        ticket.save()
+        ticket = confirm_hold(ticket_id, ObjectId(current_user_id))
         
         return jsonify({
             'message': 'Ticket activated successfully',
             'ticket': ticket.to_dict()
         }), 200
     
+    except TransitionError as e:
+        return jsonify({'error': e.message}), e.status_code
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -422,22 +666,15 @@ def use_ticket(ticket_id):
         description: Internal server error
     """
     try:
-        ticket = Ticket.objects(id=ticket_id).first()
-        
-        if not ticket:
-            return jsonify({'error': 'Ticket not found'}), 404
-        
-        if ticket.status != 'active':
-            return jsonify({'error': 'Ticket is not active'}), 400
-        
-        ticket.status = 'used'
-        ticket.save()
+        ticket = transition(ticket_id, 'used', set__used_at=datetime.utcnow())
         
         return jsonify({
             'message': 'Ticket marked as used',
             'ticket': ticket.to_dict()
         }), 200
     
+    except TransitionError as e:
+        return jsonify({'error': e.message}), e.status_code
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -491,13 +728,22 @@ def delete_ticket(ticket_id):
         if ticket.status in ['used']:
             return jsonify({'error': 'Cannot cancel used ticket'}), 400
         
-        # Return ticket to available pool if not used
-        event = Event.objects(id=ticket.event_id.id).first()
-        if event:
-            event.available_tickets += 1
-            event.save()
-        
-        ticket.delete()
+        # Return ticket to available pool only if this request removed it,
+        # so concurrent cancellations cannot release the same seat twice.
+        # The status check is repeated in the filter in case it was just used.
+        deleted = Ticket._get_collection().find_one_and_delete(
+            {'_id': ticket.id, 'status': {'$ne': 'used'}},
+            projection={'event_id': 1, 'status': 1, 'price': 1}
+        )
+        if deleted:
+            after_write(
+                lambda: release(deleted['event_id'], keys=(
+                    *ticket_keys(current_user_id), *organizer_keys(organizer_of(deleted['event_id']))
+                )),
+                lambda: record_cancellation(deleted)
+            )
+        elif Ticket.objects(id=ticket.id, status='used').count():
+            return jsonify({'error': 'Cannot cancel used ticket'}), 400
         
         return jsonify({'message': 'Ticket cancelled successfully'}), 200
     
@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 from models import User
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from mongoengine.errors import NotUniqueError, ValidationError
+from utils.auth_utils import issue_tokens
+from utils.users import resolve_user, invalidate_user
+from utils.passwords import HasherBusy
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
@@ -36,8 +39,7 @@ def get_profile():
       404:
         description: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
+    user = resolve_user(get_jwt_identity())
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -95,7 +97,7 @@ def update_profile():
         description: Internal server error
     """
     current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
+    user = resolve_user(current_user_id, fresh=True)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -116,6 +118,7 @@ def update_profile():
             user.email = data['email']
         
         user.save()
+        invalidate_user(user.id)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -159,12 +162,16 @@ def change_password():
               example: NewPassword456
     responses:
       200:
-        description: Password changed successfully
+        description: Password changed successfully; tokens issued before are revoked
         schema:
           type: object
           properties:
             message:
               type: string
+            access_token:
+              type: string
+            refresh_token:
+              type: string
       400:
         description: Current and new password are required
       401:
@@ -173,9 +180,10 @@ def change_password():
         description: User not found
       500:
         description: Internal server error
+      503:
+        description: Too many password hashes in progress, retry after Retry-After seconds
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
+    user = resolve_user(get_jwt_identity(), fresh=True)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -186,16 +194,27 @@ def change_password():
     if not data.get('currentPassword') or not data.get('newPassword'):
         return jsonify({'error': 'Current and new password are required'}), 400
     
-    # Check current password
-    if not user.check_password(data['currentPassword']):
-        return jsonify({'error': 'Current password is incorrect'}), 401
-    
     try:
+        # Check current password
+        if not user.check_password(data['currentPassword']):
+            return jsonify({'error': 'Current password is incorrect'}), 401
+        
+        # Revoke every token issued with the old password
         user.set_password(data['newPassword'])
+        user.token_version = (user.token_version or 0) + 1
         user.save()
+        invalidate_user(user.id)
         
-        return jsonify({'message': 'Password changed successfully'}), 200
+        access_token, refresh_token = issue_tokens(user)
+        
+        return jsonify({
+            'message': 'Password changed successfully',
+            'access_token': access_token,
+            'refresh_token': refresh_token
+        }), 200
     
+    except HasherBusy as e:
+        return jsonify({'error': e.message}), e.status_code, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -238,9 +257,10 @@ def delete_account():
         description: User not found
       500:
         description: Internal server error
+      503:
+        description: Too many password hashes in progress, retry after Retry-After seconds
     """
-    current_user_id = get_jwt_identity()
-    user = User.objects(id=current_user_id).first()
+    user = resolve_user(get_jwt_identity(), fresh=True)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -251,14 +271,17 @@ def delete_account():
     if not data.get('password'):
         return jsonify({'error': 'Password confirmation required'}), 400
     
-    if not user.check_password(data['password']):
-        return jsonify({'error': 'Incorrect password'}), 401
-    
     try:
+        if not user.check_password(data['password']):
+            return jsonify({'error': 'Incorrect password'}), 401
+        
         user.delete()
+        invalidate_user(user.id)
         
         return jsonify({'message': 'Account deleted successfully'}), 200
     
+    except HasherBusy as e:
+        return jsonify({'error': e.message}), e.status_code, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -296,7 +319,7 @@ def get_user(user_id):
         description: User not found
     """
     try:
-        user = User.objects(id=user_id).first()
+        user = resolve_user(user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
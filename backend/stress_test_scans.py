@@ -0,0 +1,117 @@
+"""
+Concurrent gate scanner stress test
+Run with: python stress_test_scans.py
+
+Several scanner threads try to admit the same tickets at once through the
+ticket state machine. Every ticket must be admitted exactly once, however
+the scans interleave. Point BENCH_MONGODB_URI at a local mongod; the test
+database is dropped afterwards.
+"""
+import os
+import random
+import time
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from bson import ObjectId
+from mongoengine import connect, disconnect
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MONGODB_URI = os.getenv('BENCH_MONGODB_URI', 'mongodb://localhost:27017/bilet_app_bench')
+SCANNERS = int(os.getenv('BENCH_SCANNERS', 32))
+TICKETS = int(os.getenv('BENCH_TICKETS', 2000))
+
+connect(host=MONGODB_URI, maxPoolSize=SCANNERS)
+
+from models import Ticket
+from utils.ticket_tokens import issue_token
+from utils.ticket_states import transition, TransitionError
+
+
+def load_tickets():
+    """Insert active tickets and return their ids"""
+    event_id = ObjectId()
+    user_id = ObjectId()
+    event_date = datetime.utcnow() + timedelta(days=1)
+    docs = []
+    for _ in range(TICKETS):
+        ticket_id = ObjectId()
+        docs.append({
+            '_id': ticket_id,
+            'event_id': event_id,
+            'user_id': user_id,
+            'event_title': 'Stress Test Concert',
+            'event_location': 'Stress Arena',
+            'event_date': event_date,
+            'status': 'active',
+            'purchase_date': datetime.utcnow(),
+            'price': 50.0,
+            'qr_code': issue_token(ticket_id, event_id)
+        })
+    Ticket._get_collection().insert_many(docs)
+    return [doc['_id'] for doc in docs]
+
+
+def run_stress_test():
+    """Race scanners against each other and check for double admissions"""
+    Ticket.drop_collection()
+    ticket_ids = load_tickets()
+
+    admitted = Counter()
+    rejected = Counter()
+    lock = threading.Lock()
+    start_gate = threading.Barrier(SCANNERS)
+
+    def scanner(scanner_id):
+        order = ticket_ids[:]
+        random.shuffle(order)
+        start_gate.wait()
+        for ticket_id in order:
+            try:
+                transition(ticket_id, 'used', set__scanner_id=scanner_id)
+                with lock:
+                    admitted[ticket_id] += 1
+            except TransitionError:
+                with lock:
+                    rejected[ticket_id] += 1
+
+    threads = [threading.Thread(target=scanner, args=(f'gate-{i}',)) for i in range(SCANNERS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    double_admissions = sum(1 for count in admitted.values() if count > 1)
+    never_admitted = TICKETS - len(admitted)
+    still_active = Ticket.objects(status='active').count()
+
+    print(f"\n{'='*50}")
+    print("Concurrent scanner stress test")
+    print(f"{'='*50}")
+    print(f"Scanners:           {SCANNERS}")
+    print(f"Tickets:            {TICKETS}")
+    print(f"Scan attempts:      {SCANNERS * TICKETS}")
+    print(f"Elapsed:            {elapsed:.2f}s ({SCANNERS * TICKETS / elapsed:.0f} scans/sec)")
+    print(f"Admitted:           {sum(admitted.values())}")
+    print(f"Rejected:           {sum(rejected.values())}")
+    print(f"Double admissions:  {double_admissions}")
+    print(f"Never admitted:     {never_admitted}")
+    print(f"Still active in DB: {still_active}")
+
+    passed = double_admissions == 0 and never_admitted == 0 and still_active == 0
+    print(f"\n{'✅ PASSED' if passed else '❌ FAILED'}")
+    return passed
+
+
+if __name__ == '__main__':
+    try:
+        ok = run_stress_test()
+    finally:
+        from mongoengine.connection import get_db
+        get_db().client.drop_database(get_db().name)
+        disconnect()
+    raise SystemExit(0 if ok else 1)
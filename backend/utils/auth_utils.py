@@ -1,7 +1,74 @@
+from collections import namedtuple
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from models import User
+from flask_jwt_extended import (
+    verify_jwt_in_request, get_jwt_identity, get_jwt, create_access_token, create_refresh_token
+)
+from bson import ObjectId
+from utils.users import resolve_user, token_version
+
+# Caller identity taken from verified token claims
+TokenUser = namedtuple('TokenUser', ['id', 'role', 'name'])
+
+
+class AuthError(Exception):
+    """Raised when a verified token no longer identifies a valid user"""
+
+    def __init__(self, message, status_code=401):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def token_claims(user):
+    """Claims embedded in every token issued for `user`"""
+    return {'role': user.role, 'name': user.name, 'ver': user.token_version or 0}
+
+
+def issue_tokens(user, refresh=True):
+    """Return (access token, refresh token or None) carrying the user's claims"""
+    claims = token_claims(user)
+    access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+    refresh_token = create_refresh_token(identity=str(user.id), additional_claims=claims) if refresh else None
+    return access_token, refresh_token
+
+
+def token_revoked(jwt_header, jwt_payload):
+    """JWTManager blocklist check, run for every verified token.
+
+    Rejects tokens of deleted users and tokens issued before the user's
+    last password or role change (an older `ver` claim). Only the cached
+    token version is read, so this stays cheap ahead of rate limiting.
+    """
+    user_id = jwt_payload.get('sub')
+    if not ObjectId.is_valid(user_id):
+        return True  # e.g. mock auth tokens, which name no stored user
+    version = token_version(user_id)
+    return version is None or version != jwt_payload.get('ver', 0)
+
+
+def revoked_token_response(jwt_header, jwt_payload):
+    """Error body for tokens rejected by token_revoked"""
+    return jsonify({'error': 'Token has been revoked'}), 401
+
+
+def current_token_user():
+    """Resolve the caller of a verified request from its token claims.
+
+    Revoked tokens never get here (see token_revoked). Tokens issued
+    before claims existed fall back to the user's stored role and name.
+    Raises AuthError.
+    """
+    claims = get_jwt()
+    user_id = get_jwt_identity()
+
+    if 'role' not in claims:
+        user = resolve_user(user_id)
+        if not user:
+            raise AuthError('User not found', 404)
+        return TokenUser(user.id, user.role, user.name)
+
+    return TokenUser(ObjectId(user_id), claims['role'], claims.get('name'))
 
 
 def jwt_required_custom(fn):
@@ -9,8 +76,7 @@ def jwt_required_custom(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = User.objects(id=current_user_id).first()
+        user = resolve_user(get_jwt_identity())
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,43 @@
+"""Offline validation bundles for gate scanner devices"""
+import base64
+import hashlib
+import hmac
+import os
+from datetime import datetime
+from models import Ticket
+from utils.ticket_tokens import DIGEST_LENGTH
+
+_key = os.getenv('BUNDLE_SIGNING_KEY', 'bundle-signing-key-change-this-in-production').encode()
+
+
+def configure(key):
+    """Set the secret used to sign validation bundles"""
+    global _key
+    _key = key.encode() if isinstance(key, str) else key
+
+
+def sign_bundle(event_id, generated_at, digests):
+    """Return the hex HMAC-SHA256 over a bundle's event, timestamp and digests"""
+    message = f'{event_id}|{generated_at}|'.encode() + digests.encode()
+    return hmac.new(_key, message, hashlib.sha256).hexdigest()
+
+
+def build_bundle(event_id):
+    """Build a signed bundle of the digests of every active ticket for an event.
+
+    Digests are sorted and packed as raw bytes (DIGEST_LENGTH / 2 each) in
+    base64, so a scanner can binary-search them without any server access.
+    """
+    digests = Ticket.objects(event_id=event_id, status='active').scalar('qr_digest')
+    packed = b''.join(sorted(bytes.fromhex(digest) for digest in digests if digest))
+    encoded = base64.b64encode(packed).decode()
+    generated_at = datetime.utcnow().isoformat()
+
+    return {
+        'eventId': str(event_id),
+        'generatedAt': generated_at,
+        'digestBytes': DIGEST_LENGTH // 2,
+        'count': len(packed) // (DIGEST_LENGTH // 2),
+        'digests': encoded,
+        'signature': sign_bundle(event_id, generated_at, encoded)
+    }
@@ -0,0 +1,149 @@
+"""Atomic ticket inventory operations"""
+from datetime import datetime
+from models import Event, Ticket
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
+from utils.ticket_tokens import issue_token
+from utils.response_cache import invalidate_event
+from utils.versions import bump, inventory_keys, organizer_keys, ticket_keys
+from utils.sales_counters import after_write, record_sale
+
+
+class InventoryError(Exception):
+    """Raised when tickets cannot be taken from an event"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def reserve(event_id, quantity=1):
+    """Take `quantity` tickets from an upcoming event in one conditional update.
+
+    The availability and date checks are part of the update filter, so
+    concurrent buyers can never push `available_tickets` below zero.
+    Returns the updated Event or raises InventoryError.
+    """
+    event = Event.objects(
+        id=event_id,
+        available_tickets__gte=quantity,
+        date__gt=datetime.utcnow()
+    ).modify(dec__available_tickets=quantity, new=True)
+
+    if event:
+        invalidate_event(event.id)
+        return event
+
+    # Slow path: the update matched nothing, find out why
+    event = Event.objects(id=event_id).only('available_tickets', 'date').first()
+    if not event:
+        raise InventoryError('Event not found', 404)
+    if event.date < datetime.utcnow():
+        raise InventoryError('Cannot purchase tickets for past events')
+    raise InventoryError('No tickets available')
+
+
+def release(event_id, quantity=1, keys=()):
+    """Return `quantity` tickets to an event's available pool.
+
+    Extra version `keys` the caller changed are bumped along with the event's.
+    """
+    Event.objects(id=event_id).update_one(inc__available_tickets=quantity)
+    invalidate_event(event_id)
+    bump(*inventory_keys(event_id), *keys)
+
+
+def _build_ticket(event, user, seat_number=None, status='active', expires_at=None):
+    """Create an unsaved Ticket for `event` with denormalized event data"""
+    ticket_id = ObjectId()
+    return Ticket(
+        id=ticket_id,
+        event_id=event,
+        user_id=user,
+        event_title=event.title,
+        event_location=event.location,
+        event_date=event.date,
+        status=status,
+        price=event.price,
+        seat_number=seat_number,
+        expires_at=expires_at,
+        qr_code=issue_token(ticket_id, event.id)
+    )
+
+
+def sell_ticket(event_id, user, seat_number=None, status='active', expires_at=None):
+    """Reserve one ticket and create it for `user`.
+
+    If anything fails after the reservation, the ticket is handed back to
+    the event so inventory stays consistent.
+    """
+    event = reserve(event_id)
+
+    try:
+        ticket = _build_ticket(event, user, seat_number, status, expires_at)
+        ticket.save(force_insert=True)
+    except Exception:
+        release(event.id)
+        raise
+
+    if status == 'active':
+        organizer_id = event.ref_id('organizer_id')
+        after_write(
+            lambda: bump(*inventory_keys(event.id), *ticket_keys(user.id), *organizer_keys(organizer_id)),
+            lambda: record_sale(event.id, organizer_id, revenue=ticket.price, at=ticket.purchase_date)
+        )
+    else:
+        after_write(lambda: bump(*inventory_keys(event.id), *ticket_keys(user.id)))
+    return ticket
+
+
+def sell_tickets(event_id, user, seat_numbers):
+    """Reserve len(seat_numbers) tickets at once and insert them in one batch.
+
+    `seat_numbers` holds one entry per ticket (None for unassigned seats).
+    Returns a list of (seat_number, ticket or None, error or None) in request
+    order; seats whose insert failed are returned to inventory.
+    """
+    quantity = len(seat_numbers)
+    event = reserve(event_id, quantity)
+
+    try:
+        tickets = [_build_ticket(event, user, seat_number) for seat_number in seat_numbers]
+        for ticket in tickets:
+            ticket.validate()
+    except Exception:
+        release(event.id, quantity)
+        raise
+
+    docs = [ticket.to_mongo() for ticket in tickets]
+    failed = {}
+    try:
+        Ticket._get_collection().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed = {err['index']: err.get('errmsg', 'Insert failed') for err in e.details.get('writeErrors', [])}
+    except Exception as e:
+        # A network error or timeout can follow a partial write: look up which
+        # tickets exist and only hand back the seats of the missing ones. If
+        # even that fails, the seats stay taken rather than risk an oversell.
+        written = set(Ticket._get_collection().distinct('_id', {'_id': {'$in': [doc['_id'] for doc in docs]}}))
+        if not written:
+            release(event.id, quantity)
+            raise
+        failed = {index: str(e) for index, doc in enumerate(docs) if doc['_id'] not in written}
+
+    sold = quantity - len(failed)
+    organizer_id = event.ref_id('organizer_id')
+    after_write(
+        *([lambda: release(event.id, len(failed))] if failed else []),
+        lambda: bump(*inventory_keys(event.id), *ticket_keys(user.id), *organizer_keys(organizer_id)),
+        lambda: record_sale(event.id, organizer_id, sold, sold * event.price, tickets[0].purchase_date)
+    )
+
+    results = []
+    for index, ticket in enumerate(tickets):
+        if index in failed:
+            results.append((ticket.seat_number, None, failed[index]))
+        else:
+            results.append((ticket.seat_number, ticket, None))
+    return results
@@ -0,0 +1,38 @@
+"""Flask JSON provider backed by orjson, when installed
+
+Output matches the default provider: keys are sorted, debug responses
+are indented and datetimes and other extra types are still encoded by
+Flask's default(). orjson writes non-ASCII characters as UTF-8 instead
+of \\u escapes, which is the same JSON.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.pop('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop('indent', None):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.pop('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def init_json(app, encoder='auto'):
+    """Install the orjson provider for 'orjson', or for 'auto' when available"""
+    if encoder == 'json' or (encoder == 'auto' and orjson is None):
+        return
+    if orjson is None:
+        print("⚠️ orjson package not installed, using the default JSON encoder")
+        return
+    app.json = OrjsonProvider(app)
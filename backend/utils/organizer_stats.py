@@ -0,0 +1,79 @@
+"""Organizer sales statistics
+
+Dashboard reads come from the materialized counters in utils.sales_counters;
+ticket_totals() is the aggregation those counters are reconciled against.
+"""
+from datetime import datetime
+from models import Event, Ticket, SalesCounter
+
+
+def ticket_totals(event_ids=None):
+    """Return {event_id: {status: (count, revenue)}} for the given events (or all).
+
+    Tickets are grouped by a single $match/$group aggregation, so only one
+    small document per (event, status) pair leaves the database.
+    """
+    pipeline = [
+        {'$group': {
+            '_id': {'event': '$event_id', 'status': '$status'},
+            'count': {'$sum': 1},
+            'revenue': {'$sum': {'$ifNull': ['$price', 0]}}
+        }}
+    ]
+    queryset = Ticket.objects if event_ids is None else Ticket.objects(event_id__in=event_ids)
+    totals = {}
+    for row in queryset.aggregate(pipeline):
+        key = row['_id']
+        totals.setdefault(key['event'], {})[key['status']] = (row['count'], float(row['revenue']))
+    return totals
+
+
+def _summary(counter):
+    """Public fields for a counter document (or an empty one)"""
+    sold = counter.get('sold', 0)
+    used = counter.get('used', 0)
+    expired = counter.get('expired', 0)
+    return {
+        'ticketsSold': sold,
+        'revenue': counter.get('revenue', 0.0),
+        'cancelledTickets': counter.get('cancelled', 0),
+        'ticketsByStatus': {'active': sold - used - expired, 'used': used, 'expired': expired}
+    }
+
+
+def compute_stats(organizer_id, include_events=False):
+    """Return dashboard statistics for an organizer.
+
+    Ticket figures come from one counter document, and event figures from
+    two index-only counts, so the cost does not grow with tickets sold.
+    Pending holds are not counted as sales. `include_events` adds a
+    per-event breakdown, which reads one counter per event.
+    """
+    counter = SalesCounter.objects(key=f'organizer:{organizer_id}').as_pymongo().first() or {}
+    events = Event.objects(organizer_id=organizer_id)
+    summary = _summary(counter)
+
+    stats = {
+        'totalEvents': events.count(),
+        'upcomingEvents': events.filter(date__gt=datetime.now()).count(),
+        'totalTicketsSold': summary['ticketsSold'],
+        'totalRevenue': summary['revenue'],
+        'cancelledTickets': summary['cancelledTickets'],
+        'ticketsByStatus': summary['ticketsByStatus']
+    }
+
+    if include_events:
+        counters = {
+            doc['_id']: doc
+            for doc in SalesCounter.objects(organizer_id=organizer_id).as_pymongo()
+        }
+        stats['events'] = [
+            {
+                'eventId': str(event['_id']),
+                'title': event.get('title'),
+                **_summary(counters.get(f"event:{event['_id']}", {}))
+            }
+            for event in events.only('id', 'title').as_pymongo()
+        ]
+
+    return stats
@@ -0,0 +1,74 @@
+"""Keyset (cursor) pagination for list endpoints"""
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from flask import request
+from mongoengine import Q
+
+
+def encode_cursor(value, object_id):
+    """Return an opaque cursor for a (sort value, _id) position"""
+    raw = json.dumps([value.isoformat(), str(object_id)]).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor):
+    """Return the (datetime, ObjectId) position of a cursor, or raise ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, object_id = json.loads(raw)
+        return datetime.fromisoformat(value), ObjectId(object_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def paginate(queryset, field, descending=False):
+    """Paginate a queryset ordered by (`field`, _id) using the request args.
+
+    With `cursor` the next page is found with a range query on the compound
+    (field, _id) index, so deep pages cost the same as the first one. A
+    legacy `page` number falls back to skip/limit. The total count is only
+    computed when `include_total=true`. Works on as_pymongo() querysets
+    too. Returns (documents, metadata).
+    """
+    cursor = request.args.get('cursor')
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+
+    meta = {}
+    if include_total:
+        total = queryset.count()
+        meta['total'] = total
+        meta['pages'] = (total + per_page - 1) // per_page  # Calculate total pages
+
+    sign = '-' if descending else ''
+    ordered = queryset.order_by(f'{sign}{field}', f'{sign}id')
+
+    if cursor:
+        value, object_id = decode_cursor(cursor)
+        op = 'lt' if descending else 'gt'
+        ordered = ordered.filter(
+            Q(**{f'{field}__{op}': value}) |
+            (Q(**{field: value}) & Q(**{f'id__{op}': object_id}))
+        )
+    elif page > 1:
+        ordered = ordered.skip((page - 1) * per_page)
+        meta['current_page'] = page
+    else:
+        meta['current_page'] = 1
+
+    # Fetch one extra document to learn whether another page exists
+    documents = list(ordered.limit(per_page + 1))
+    has_more = len(documents) > per_page
+    documents = documents[:per_page]
+
+    meta['next_cursor'] = None
+    if has_more:
+        last = documents[-1]
+        if isinstance(last, dict):
+            meta['next_cursor'] = encode_cursor(last[field], last['_id'])
+        else:
+            meta['next_cursor'] = encode_cursor(getattr(last, field), last.id)
+    return documents, meta
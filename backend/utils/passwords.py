@@ -0,0 +1,87 @@
+"""Password hashing with a configurable method and a bounded worker pool
+
+Hashes use Werkzeug's "method$salt$hash" format, so the method and its
+cost ("scrypt:32768:8:1", "pbkdf2:sha256:600000", ...) travel with every
+stored hash. Changing PASSWORD_HASH_METHOD therefore needs no migration:
+existing hashes still verify and are rehashed on the user's next login.
+
+hashlib's scrypt and pbkdf2 release the GIL, so hashing runs on a small
+thread pool. At most PASSWORD_HASH_WORKERS hashes run at once, and a
+login storm beyond PASSWORD_HASH_QUEUE_SIZE waiting jobs is turned away
+with HasherBusy instead of tying up every web worker.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+_method = 'scrypt'
+_prefix = None
+_pool = None
+_pool_lock = threading.Lock()
+_workers = 2
+_slots = threading.BoundedSemaphore(64)
+
+
+class HasherBusy(Exception):
+    """Raised when too many hashing jobs are already queued"""
+
+    def __init__(self, message='Too many login attempts, please retry shortly', status_code=503):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def configure(method='scrypt', workers=2, queue_size=64):
+    """Set the hash method for new hashes, worker count and maximum queued jobs"""
+    global _method, _prefix, _workers, _slots, _pool
+    _method = method
+    _prefix = None
+    _workers = workers
+    _slots = threading.BoundedSemaphore(queue_size)
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def _get_pool():
+    """Lazily start the hashing thread pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix='password-hash')
+        return _pool
+
+
+def _run(fn, *args):
+    """Run `fn` in the pool and wait for it, raising HasherBusy when full"""
+    if not _slots.acquire(blocking=False):
+        raise HasherBusy()
+    try:
+        return _get_pool().submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def method_prefix():
+    """The method string new hashes are stored with, defaults filled in"""
+    global _prefix
+    if _prefix is None:
+        # Werkzeug expands bare methods ("scrypt") with its own defaults
+        _prefix = generate_password_hash('', _method).split('$', 1)[0]
+    return _prefix
+
+
+def hash_password(password):
+    """Hash `password` with the configured method"""
+    return _run(generate_password_hash, password, _method)
+
+
+def verify_password(password_hash, password):
+    """Check `password` against a stored hash of any supported method"""
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Whether a stored hash uses a different method or cost than configured"""
+    return password_hash.split('$', 1)[0] != method_prefix()
@@ -1,10 +1,45 @@
 import qrcode
 import io
 import base64
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.cache import TTLCache
 
+# Rendering is CPU-bound Pillow work, so it runs in worker processes.
+# In-flight jobs are capped so a checkout spike cannot queue unbounded work.
+_pool = None
+_pool_lock = threading.Lock()
+_workers = 2
+_slots = threading.BoundedSemaphore(64)
 
-def generate_qr_code(data):
-    """Generate QR code and return as base64 string"""
+# Rendered PNGs keyed by QR data
+_cache = TTLCache(maxsize=1024, ttl=3600)
+
+
+def configure(workers=2, queue_size=64, cache_size=1024, cache_ttl=3600):
+    """Set worker process count, maximum queued renders and PNG cache limits"""
+    global _workers, _slots
+    _workers = workers
+    _slots = threading.BoundedSemaphore(queue_size)
+    _cache.maxsize = cache_size
+    _cache.ttl = cache_ttl
+
+
+def _get_pool():
+    """Lazily start the worker pool (spawned, so no Mongo sockets are forked)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def render_qr_png(data):
+    """Render QR code data to PNG bytes"""
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -16,10 +51,33 @@ def generate_qr_code(data):
     
     img = qr.make_image(fill_color="black", back_color="white")
     
-    # Convert to base64
     buffered = io.BytesIO()
     img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    
+    return buffered.getvalue()
+
+
+def generate_qr_code(data):
+    """Generate QR code and return as base64 string"""
+    img_str = base64.b64encode(render_qr_png(data)).decode()
     return f"data:image/png;base64,{img_str}"
 
+
+def render_png(data):
+    """Return a cached QR PNG, rendering it in the worker pool on a miss.
+
+    When the pool queue is full the image is rendered inline instead.
+    """
+    png = _cache.get(data)
+    if png is not None:
+        return png
+
+    if _slots.acquire(blocking=False):
+        try:
+            png = _get_pool().submit(render_qr_png, data).result()
+        finally:
+            _slots.release()
+    else:
+        png = render_qr_png(data)
+
+    _cache.set(data, png)
+    return png
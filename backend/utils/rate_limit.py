@@ -0,0 +1,154 @@
+"""Token-bucket rate limiting for expensive endpoints
+
+Each limited route keeps one bucket per caller: the verified token
+identity on authenticated routes, the client IP otherwise. Only verified
+identities are trusted, so a caller cannot dodge its bucket or drain
+someone else's by sending made-up claims. On JWT routes the check goes
+below @jwt_required(); it still runs before the handler touches the
+database, so excess traffic is answered with 429 and Retry-After.
+
+Buckets live in a pluggable backend: in-process ('memory', per worker)
+or a shared Redis-style store ('shared', across workers) that falls back
+to cache.FakeSharedClient without a REDIS_URL.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from utils.cache import FakeSharedClient
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+
+class MemoryBuckets:
+    """In-process buckets; the least recently used are dropped past `maxsize`"""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst):
+        """Take one token, returning 0 or the seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                self._buckets.move_to_end(key)
+                if len(self._buckets) > self.maxsize:
+                    # An evicted bucket restarts full, as if its caller had been idle
+                    self._buckets.popitem(last=False)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+class SharedBuckets:
+    """Buckets in a shared Redis-style store, as "tokens:timestamp" strings.
+
+    The read and write are not atomic, so concurrent workers can admit a
+    few requests beyond the limit; entries expire once a bucket is full.
+    """
+
+    def __init__(self, client, prefix='bilet:ratelimit:'):
+        self._client = client
+        self._prefix = prefix
+
+    def take(self, key, rate, burst):
+        key = self._prefix + key
+        now = time.time()
+        state = self._client.get(key)
+        if state is None:
+            tokens, updated = burst, now
+        else:
+            tokens, updated = (float(part) for part in (
+                state.decode() if isinstance(state, bytes) else state
+            ).split(':'))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0 if tokens >= 1 else (1 - tokens) / rate
+        if not wait:
+            tokens -= 1
+        self._client.set(key, f'{tokens:.4f}:{now:.4f}', ex=math.ceil(burst / rate) + 1)
+        return wait
+
+
+class RateLimiter:
+    """Named limits over a bucket backend"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.limits = {}
+        self.rejected = 0
+
+    def check(self, name):
+        """Take a token for the current caller of a route, returning the wait"""
+        limit = self.limits.get(name)
+        if self.backend is None or limit is None:
+            return 0
+        rate, burst = limit
+        return self.backend.take(f'{request.endpoint}:{caller_key()}', rate, burst)
+
+
+limiter = RateLimiter(MemoryBuckets())
+
+
+def parse_limit(value):
+    """Parse "N/period" (period: second, minute or hour) into (rate per second, burst)"""
+    count, _, period = value.partition('/')
+    count = int(count)
+    return count / PERIODS[period.strip() or 'second'], count
+
+
+def configure(backend='memory', limits=None, maxsize=100000, redis_url=None):
+    """Select the bucket backend ('memory', 'shared' or 'none') and set limits.
+
+    `limits` maps a limit name to "N/period"; empty values disable it.
+    """
+    if backend == 'none':
+        limiter.backend = None
+    elif backend == 'shared':
+        client = None
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url)
+            except ImportError:
+                print("⚠️ redis package not installed, using in-process rate limit stand-in")
+        limiter.backend = SharedBuckets(client or FakeSharedClient())
+    else:
+        limiter.backend = MemoryBuckets(maxsize=maxsize)
+    limiter.limits = {name: parse_limit(value) for name, value in (limits or {}).items() if value}
+
+
+def caller_key():
+    """Bucket key of the current caller: its verified identity, else its IP"""
+    try:
+        subject = get_jwt_identity()
+    except RuntimeError:
+        subject = None  # no token was verified for this request
+    return f'user:{subject}' if subject else f'ip:{request.remote_addr}'
+
+
+def rate_limited(name):
+    """Reject callers over the `name` limit with 429 before running the view.
+
+    On authenticated routes apply it below @jwt_required() (or the
+    organizer decorator), so the bucket belongs to the verified caller.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            wait = limiter.check(name)
+            if wait:
+                limiter.rejected += 1
+                return jsonify({'error': 'Too many requests, please retry later'}), 429, {
+                    'Retry-After': str(math.ceil(wait))
+                }
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
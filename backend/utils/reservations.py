@@ -0,0 +1,76 @@
+"""Time-bounded ticket holds for the pending -> active checkout flow"""
+import threading
+from datetime import datetime, timedelta
+from mongoengine import Q
+from models import Ticket
+from utils.inventory import sell_ticket, release
+from utils.ticket_states import transition
+from utils.versions import bump, ticket_keys
+
+
+def create_hold(event_id, user, seat_number=None, hold_minutes=10):
+    """Reserve one ticket as a pending hold that expires after `hold_minutes`"""
+    expires_at = datetime.utcnow() + timedelta(minutes=hold_minutes)
+    return sell_ticket(event_id, user, seat_number=seat_number, status='pending', expires_at=expires_at)
+
+
+def confirm_hold(ticket_id, user_id):
+    """Turn a live pending hold into an active ticket.
+
+    The ownership, status and expiry checks are part of the update filter,
+    so a hold cannot be confirmed after the sweeper has started reclaiming it.
+    """
+    return transition(
+        ticket_id, 'active',
+        user_id=user_id,
+        condition=Q(expires_at=None) | Q(expires_at__gt=datetime.utcnow()),
+        condition_error='Reservation has expired',
+        unset__expires_at=True
+    )
+
+
+def release_expired_holds(now=None):
+    """Delete expired pending holds and return their tickets to inventory.
+
+    Each hold is removed with its own find-and-delete, so a hold confirmed
+    concurrently is never reclaimed. Returns the number of holds released.
+    """
+    now = now or datetime.utcnow()
+    collection = Ticket._get_collection()
+    released = {}
+    owners = set()
+
+    while True:
+        hold = collection.find_one_and_delete(
+            {'status': 'pending', 'expires_at': {'$lte': now}},
+            projection={'event_id': 1, 'user_id': 1}
+        )
+        if not hold:
+            break
+        released[hold['event_id']] = released.get(hold['event_id'], 0) + 1
+        owners.add(hold['user_id'])
+
+    for event_id, count in released.items():
+        release(event_id, count)
+    if owners:
+        bump(*ticket_keys(*owners))
+
+    return sum(released.values())
+
+
+def start_sweeper(interval):
+    """Run release_expired_holds every `interval` seconds on a daemon thread"""
+    stop = threading.Event()
+
+    def sweep():
+        while not stop.wait(interval):
+            try:
+                released = release_expired_holds()
+                if released:
+                    print(f"♻️ Released {released} expired ticket holds")
+            except Exception as e:
+                print(f"❌ Hold sweeper error: {e}")
+
+    thread = threading.Thread(target=sweep, name='hold-sweeper', daemon=True)
+    thread.start()
+    return stop
@@ -0,0 +1,195 @@
+"""Response cache for public read endpoints
+
+Cached bodies live in a pluggable backend: an in-process LRU with TTL
+('memory'), or a shared key-value store ('shared') with a Redis-style
+get/set/delete/incr client. Without a REDIS_URL (or without the optional
+redis package) the shared backend runs on FakeSharedClient, an in-process
+stand-in with the same interface.
+
+List keys embed a generation counter, so a single increment invalidates
+every cached page at once; detail keys are deleted one by one.
+
+Under @conditional, a body is stored together with the resource versions
+it was rendered under and only served while they are still current. The
+ETag then always describes the body sent, even when another worker made
+the change and this worker's invalidation never ran.
+"""
+import threading
+from functools import wraps
+from flask import Response, request, make_response, g
+from mongoengine import signals
+from models import Event
+from utils.cache import TTLCache, FakeSharedClient
+
+
+class MemoryBackend:
+    """In-process LRU + TTL storage"""
+
+    def __init__(self, maxsize=2048, ttl=30):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def counter(self, name):
+        return self._counters.get(name, 0)
+
+    def incr(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def size(self):
+        return len(self._cache)
+
+
+class SharedBackend:
+    """Storage in a shared Redis-style store, visible to every worker"""
+
+    def __init__(self, client, ttl=30, prefix='bilet:cache:'):
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key):
+        return self._client.get(self._prefix + key)
+
+    def set(self, key, value):
+        self._client.set(self._prefix + key, value, ex=self._ttl)
+
+    def delete(self, key):
+        self._client.delete(self._prefix + key)
+
+    def counter(self, name):
+        return int(self._client.get(self._prefix + 'gen:' + name) or 0)
+
+    def incr(self, name):
+        self._client.incr(self._prefix + 'gen:' + name)
+
+    def size(self):
+        return self._client.dbsize()
+
+
+class ResponseCache:
+    """Caches JSON response bodies and tracks hit-rate metrics"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Return hit/miss counters and the current hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'size': self.backend.size() if self.backend else 0
+        }
+
+
+cache = ResponseCache(MemoryBackend())
+
+
+def configure(backend='memory', ttl=30, maxsize=2048, redis_url=None):
+    """Select the cache backend: 'memory', 'shared' or 'none'"""
+    if backend == 'none':
+        cache.backend = None
+    elif backend == 'shared':
+        client = None
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url)
+            except ImportError:
+                print("⚠️ redis package not installed, using in-process shared cache stand-in")
+        cache.backend = SharedBackend(client or FakeSharedClient(), ttl=ttl)
+    else:
+        cache.backend = MemoryBackend(maxsize=maxsize, ttl=ttl)
+
+    signals.post_save.connect(_on_event_changed, sender=Event)
+    signals.post_delete.connect(_on_event_changed, sender=Event)
+
+
+def normalized_args():
+    """Query args as a stable string, independent of their order in the URL"""
+    return '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+
+
+def list_key(namespace):
+    """Cache key for a list endpoint, scoped to the current list generation"""
+    return f'{namespace}:{cache.backend.counter(namespace)}:{normalized_args()}'
+
+
+def _version_tag():
+    """Resource versions read by @conditional for this request, as bytes"""
+    versions = g.get('resource_versions')
+    return repr(sorted(versions.items())).encode() if versions else b''
+
+
+def cached(key_fn):
+    """Serve a view's 200 responses from the cache, keyed by key_fn(**view_args)"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            backend = cache.backend
+            if backend is None:
+                return fn(*args, **kwargs)
+
+            key = key_fn(**kwargs)
+            tag = _version_tag()
+            stored = backend.get(key)
+            body = None
+            if stored is not None:
+                stored_tag, _, body = stored.partition(b'\n')
+                if stored_tag != tag:
+                    body = None  # rendered under other versions than the ETag describes
+            cache._record(body is not None)
+            if body is not None:
+                response = Response(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                backend.set(key, tag + b'\n' + response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_event(event_id):
+    """Drop cached data that shows an event's fields or inventory"""
+    if cache.backend is None:
+        return
+    cache.backend.delete(f'events:detail:{event_id}')
+    cache.backend.incr('events:list')
+
+
+def invalidate_categories():
+    """Drop the cached category list"""
+    if cache.backend is not None:
+        cache.backend.incr('events:categories')
+
+
+def _on_event_changed(sender, document, **kwargs):
+    invalidate_event(document.id)
+    invalidate_categories()
@@ -0,0 +1,185 @@
+"""Incrementally maintained per-event and per-organizer sales counters
+
+Purchase, confirmation, use, expiry and cancellation paths $inc the
+counters of the event and of its organizer in one round trip, right
+after their own write (through after_write(), so a failure there never
+fails the request). A crash between the two writes leaves drift,
+which reconcile() detects (and optionally repairs) by recomputing the
+counters from the tickets. Sales and cancellations also feed the hourly
+rollups in utils.sales_rollup.
+"""
+from bson import ObjectId
+from mongoengine import signals
+from pymongo import UpdateOne
+from models import Event, SalesCounter
+from utils.cache import TTLCache
+from utils.organizer_stats import ticket_totals
+from utils import sales_rollup
+
+# Counters that can be recomputed from existing tickets (cancelled tickets are gone)
+RECOUNTABLE = ('sold', 'used', 'expired', 'revenue')
+
+# Counter changes for status transitions other than a hold becoming a sale
+TRANSITION_DELTAS = {
+    ('active', 'used'): {'used': 1},
+    ('active', 'expired'): {'expired': 1},
+}
+
+# An event's organizer never changes, so lookups are cached
+_organizers = TTLCache(maxsize=10000, ttl=3600)
+
+
+def event_key(event_id):
+    return f'event:{event_id}'
+
+
+def organizer_key(organizer_id):
+    return f'organizer:{organizer_id}'
+
+
+def organizer_of(event_id):
+    """Return the organizer ObjectId of an event, or None"""
+    organizer_id = _organizers.get(event_id)
+    if organizer_id is None:
+        doc = Event._get_collection().find_one({'_id': event_id}, {'organizer_id': 1})
+        organizer_id = doc.get('organizer_id') if doc else None
+        if organizer_id is not None:
+            _organizers.set(event_id, organizer_id)
+    return organizer_id
+
+
+def after_write(*steps):
+    """Run the bookkeeping steps (callables) that follow a committed write.
+
+    Each failure is logged and skipped rather than raised: the write has
+    already happened, so it must not turn into an error the client retries.
+    Counter drift left behind is what reconcile() is for.
+    """
+    for step in steps:
+        try:
+            step()
+        except Exception as e:
+            print(f"⚠️ Bookkeeping after a committed write failed: {e}")
+
+
+def record(event_id, organizer_id=None, **deltas):
+    """$inc the counters of an event and its organizer by `deltas`"""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    if organizer_id is None:
+        organizer_id = organizer_of(event_id)
+
+    operations = [UpdateOne(
+        {'_id': event_key(event_id)},
+        {'$inc': deltas, '$set': {'organizer_id': organizer_id}},
+        upsert=True
+    )]
+    if organizer_id is not None:
+        operations.append(UpdateOne({'_id': organizer_key(organizer_id)}, {'$inc': deltas}, upsert=True))
+    SalesCounter._get_collection().bulk_write(operations, ordered=False)
+
+
+def record_sale(event_id, organizer_id=None, count=1, revenue=0.0, at=None):
+    """Count `count` tickets sold at `at` (default now) in counters and rollups"""
+    if count:
+        record(event_id, organizer_id, sold=count, revenue=revenue)
+        sales_rollup.record(event_id, at, sold=count, revenue=revenue)
+
+
+def record_transition(ticket, from_status, to_status):
+    """Apply the counter changes of a completed status transition"""
+    if (from_status, to_status) == ('pending', 'active'):
+        record_sale(ticket.ref_id('event_id'), revenue=ticket.price or 0.0, at=ticket.purchase_date)
+        return
+    deltas = TRANSITION_DELTAS.get((from_status, to_status))
+    if deltas:
+        record(ticket.ref_id('event_id'), **deltas)
+
+
+def record_cancellation(ticket_doc):
+    """Apply the counter changes of a deleted ticket (a raw pymongo document)"""
+    if ticket_doc['status'] not in ('active', 'expired'):
+        return
+    price = ticket_doc.get('price') or 0.0
+    record(
+        ticket_doc['event_id'],
+        sold=-1,
+        cancelled=1,
+        expired=-1 if ticket_doc['status'] == 'expired' else 0,
+        revenue=-price
+    )
+    sales_rollup.record(ticket_doc['event_id'], cancelled=1, refunded=price)
+
+
+def _expected_counters():
+    """Recount from tickets, returning ({key: {counter: value}}, {event id: organizer id})"""
+    organizers = {
+        doc['_id']: doc.get('organizer_id')
+        for doc in Event.objects.only('organizer_id').as_pymongo()
+    }
+    expected = {}
+    for event_id, statuses in ticket_totals().items():
+        if event_id not in organizers:
+            continue  # tickets left behind by a deleted event
+        counts = {status: count for status, (count, _) in statuses.items()}
+        values = {
+            'sold': sum(count for status, count in counts.items() if status != 'pending'),
+            'used': counts.get('used', 0),
+            'expired': counts.get('expired', 0),
+            'revenue': sum(revenue for status, (_, revenue) in statuses.items() if status != 'pending')
+        }
+        keys = [event_key(event_id)]
+        if organizers[event_id] is not None:
+            keys.append(organizer_key(organizers[event_id]))
+        for key in keys:
+            totals = expected.setdefault(key, dict.fromkeys(RECOUNTABLE, 0))
+            for name, value in values.items():
+                totals[name] += value
+    return expected, organizers
+
+
+def reconcile(fix=False):
+    """Compare stored counters with a recount from tickets.
+
+    Returns a list of {'key', 'counter', 'stored', 'expected'} drift
+    entries. With `fix`, drifted counters are overwritten with the recount.
+    Writes that land while the recount runs can show up as transient drift.
+    """
+    expected, organizers = _expected_counters()
+    stored = {doc['_id']: doc for doc in SalesCounter.objects.as_pymongo()}
+
+    drift = []
+    fixes = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, dict.fromkeys(RECOUNTABLE, 0))
+        have = stored.get(key, {})
+        changed = {}
+        for name in RECOUNTABLE:
+            stored_value = have.get(name, 0)
+            if abs(stored_value - want[name]) > 1e-6:
+                drift.append({'key': key, 'counter': name, 'stored': stored_value, 'expected': want[name]})
+                changed[name] = want[name]
+        if changed:
+            if key.startswith('event:'):
+                changed['organizer_id'] = organizers.get(ObjectId(key.split(':', 1)[1]))
+            fixes.append(UpdateOne({'_id': key}, {'$set': changed}, upsert=True))
+
+    if fix and fixes:
+        SalesCounter._get_collection().bulk_write(fixes, ordered=False)
+    return drift
+
+
+def _on_event_deleted(sender, document, **kwargs):
+    """Drop a deleted event's counters and take them out of its organizer's totals"""
+    counter = SalesCounter._get_collection().find_one_and_delete({'_id': event_key(document.id)})
+    if counter and counter.get('organizer_id') is not None:
+        SalesCounter._get_collection().update_one(
+            {'_id': organizer_key(counter['organizer_id'])},
+            {'$inc': {name: -counter.get(name, 0) for name in RECOUNTABLE + ('cancelled',)}}
+        )
+
+
+def init_sales_counters():
+    """Keep organizer counters in sync with event deletions"""
+    signals.post_delete.connect(_on_event_deleted, sender=Event)
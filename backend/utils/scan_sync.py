@@ -0,0 +1,119 @@
+"""Batched merge of offline gate scans"""
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from models import Ticket
+from utils.versions import bump, organizer_keys, ticket_keys
+from utils.sales_counters import after_write, organizer_of, record
+from utils.sales_rollup import parse_utc
+
+
+def _parse_time(value):
+    """Parse an ISO timestamp from a scanner, falling back to now"""
+    try:
+        return parse_utc(value)
+    except (AttributeError, ValueError):
+        return datetime.utcnow()
+
+
+def _key(scan):
+    """Return ('_id', ObjectId) or ('qr_digest', str) for a scan record, or None"""
+    if scan.get('ticketId'):
+        try:
+            return '_id', ObjectId(scan['ticketId'])
+        except (InvalidId, TypeError):
+            return None
+    if scan.get('digest'):
+        return 'qr_digest', scan['digest']
+    return None
+
+
+def apply_scans(event_id, scans):
+    """Mark the scanned tickets of an event as used in one bulk write.
+
+    Every scan is reported individually:
+      used       - this batch admitted the ticket
+      duplicate  - the ticket was already admitted by the same scanner,
+                   or appears earlier in this batch
+      conflict   - the ticket was admitted by another scanner or is not active
+      not_found  - no ticket of this event matches
+      invalid    - the record has no usable ticketId or digest
+    Uses a fixed number of round trips however large the batch is.
+    """
+    keys = [_key(scan) for scan in scans]
+    ids = [key[1] for key in keys if key and key[0] == '_id']
+    digests = [key[1] for key in keys if key and key[0] == 'qr_digest']
+
+    collection = Ticket._get_collection()
+    projection = {'_id': 1, 'qr_digest': 1, 'status': 1, 'scanner_id': 1, 'user_id': 1}
+
+    def load(filter_ids, filter_digests):
+        """Fetch current state for the given keys, indexed both ways"""
+        clauses = []
+        if filter_ids:
+            clauses.append({'_id': {'$in': filter_ids}})
+        if filter_digests:
+            clauses.append({'qr_digest': {'$in': filter_digests}})
+        if not clauses:
+            return {}
+        found = {}
+        for doc in collection.find({'event_id': event_id, '$or': clauses}, projection):
+            found[('_id', doc['_id'])] = doc
+            if doc.get('qr_digest'):
+                found[('qr_digest', doc['qr_digest'])] = doc
+        return found
+
+    current = load(ids, digests)
+
+    results = [None] * len(scans)
+    pending = {}  # ticket _id -> index of the scan that will admit it
+    operations = []
+
+    for index, (scan, key) in enumerate(zip(scans, keys)):
+        scanner_id = scan.get('scannerId')
+        if key is None:
+            results[index] = 'invalid'
+            continue
+
+        doc = current.get(key)
+        if doc is None:
+            results[index] = 'not_found'
+        elif doc['_id'] in pending:
+            results[index] = 'duplicate'
+        elif doc['status'] == 'used':
+            results[index] = 'duplicate' if doc.get('scanner_id') == scanner_id else 'conflict'
+        elif doc['status'] != 'active':
+            results[index] = 'conflict'
+        else:
+            pending[doc['_id']] = index
+            operations.append(UpdateOne(
+                {'_id': doc['_id'], 'status': 'active'},
+                {'$set': {
+                    'status': 'used',
+                    'used_at': _parse_time(scan.get('scannedAt')),
+                    'scanner_id': scanner_id
+                }}
+            ))
+
+    if operations:
+        result = collection.bulk_write(operations, ordered=False)
+        after_write(lambda: bump(
+            *ticket_keys(*{current[('_id', ticket_id)]['user_id'] for ticket_id in pending}),
+            *organizer_keys(organizer_of(event_id))
+        ))
+
+        # Some tickets changed between the read and the write: re-check them
+        if result.modified_count < len(operations):
+            after = load(list(pending), [])
+            for ticket_id, index in pending.items():
+                doc = after.get(('_id', ticket_id))
+                admitted = doc and doc['status'] == 'used' and doc.get('scanner_id') == scans[index].get('scannerId')
+                results[index] = 'used' if admitted else 'conflict'
+        else:
+            for index in pending.values():
+                results[index] = 'used'
+
+        after_write(lambda: record(event_id, used=result.modified_count))
+
+    return results
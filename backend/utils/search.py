@@ -0,0 +1,162 @@
+"""Event full-text search
+
+Searches go through MongoDB's weighted text index by default. When
+SEARCH_BACKEND is 'memory' (e.g. a local or mock backend without $text
+support) an in-process inverted index is used instead; it is built at
+startup and kept fresh through Event save/delete signals, and rebuilt in
+the background when the shared 'events' version shows a write made by
+another worker.
+"""
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from flask import request
+from mongoengine import signals
+from models import Event
+from utils.versions import watch
+
+# Relevance weight of each searchable field, shared by both backends
+FIELD_WEIGHTS = {'title': 10, 'location': 5, 'description': 1}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+_backend = 'mongo'
+
+
+def normalize(text):
+    """Lowercase and strip accents so 'İstanbul' matches 'istanbul'"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    """Split text into normalized word tokens"""
+    return _TOKEN_RE.findall(normalize(text or ''))
+
+
+class InvertedIndex:
+    """Thread-safe token -> {event id: weighted score} index"""
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._tokens = {}  # event id -> tokens it was indexed under
+        self._lock = threading.Lock()
+
+    def add(self, event_id, fields):
+        """Index (or re-index) an event from a {field: text} mapping"""
+        scores = defaultdict(int)
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(fields.get(field)):
+                scores[token] += weight
+
+        with self._lock:
+            self._discard(event_id)
+            for token, score in scores.items():
+                self._postings[token][event_id] = score
+            self._tokens[event_id] = list(scores)
+
+    def remove(self, event_id):
+        """Drop an event from the index"""
+        with self._lock:
+            self._discard(event_id)
+
+    def _discard(self, event_id):
+        for token in self._tokens.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def replace(self, other):
+        """Take over the contents of `other`, e.g. a freshly built index"""
+        with self._lock:
+            self._postings, self._tokens = other._postings, other._tokens
+
+    def search(self, text):
+        """Return [(event id, score)] matching every query token, best first"""
+        tokens = set(tokenize(text))
+        if not tokens:
+            return []
+
+        with self._lock:
+            postings = sorted((self._postings.get(token, {}) for token in tokens), key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting.keys()
+            scored = [(event_id, sum(posting[event_id] for posting in postings)) for event_id in matches]
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+index = InvertedIndex()
+
+
+def build_index():
+    """Rebuild the in-process index from every event in the database"""
+    fields = list(FIELD_WEIGHTS)
+    fresh = InvertedIndex()
+    for doc in Event.objects.only(*fields).as_pymongo():
+        fresh.add(doc['_id'], doc)
+    index.replace(fresh)
+
+
+def _on_event_saved(sender, document, **kwargs):
+    index.add(document.id, {field: getattr(document, field) for field in FIELD_WEIGHTS})
+
+
+def _on_event_deleted(sender, document, **kwargs):
+    index.remove(document.id)
+
+
+def init_search(backend='mongo', refresh_interval=5):
+    """Select the search backend, building the in-process index if needed.
+
+    A background thread checks the 'events' version of the in-process index
+    every `refresh_interval` seconds and rebuilds on change (0 disables).
+    """
+    global _backend
+    _backend = backend
+    if backend == 'memory':
+        if refresh_interval:
+            watch('events', refresh_interval, build_index, name='search-refresh')
+        try:
+            build_index()
+        except Exception as e:
+            print(f"⚠️ Could not build search index: {e}")
+        signals.post_save.connect(_on_event_saved, sender=Event)
+        signals.post_delete.connect(_on_event_deleted, sender=Event)
+
+
+def search_events(queryset, text):
+    """Return (events, metadata) for `text` ordered by relevance.
+
+    Results are paginated by the `page` and `per_page` request args; other
+    filters already applied to `queryset` still hold.
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    start = (page - 1) * per_page
+
+    if _backend == 'memory':
+        ranked = [event_id for event_id, _ in index.search(text)]
+        allowed = set(queryset.filter(id__in=ranked).scalar('id'))
+        ranked = [event_id for event_id in ranked if event_id in allowed]
+        window = ranked[start:start + per_page]
+        by_id = {event.id: event for event in Event.objects(id__in=window)}
+        events = [by_id[event_id] for event_id in window if event_id in by_id]
+        has_more = len(ranked) > start + per_page
+    else:
+        results = list(queryset.search_text(text).order_by('$text_score').skip(start).limit(per_page + 1))
+        events = results[:per_page]
+        has_more = len(results) > per_page
+
+    return events, {
+        'current_page': page,
+        'next_page': page + 1 if has_more else None
+    }
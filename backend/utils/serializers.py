@@ -0,0 +1,80 @@
+"""API serialization of events, tickets and users from raw documents
+
+Each serializer is built once from a field map of (output key, stored
+field, converter) and works on a raw pymongo document, such as one from
+as_pymongo(). Model to_dict() methods go through the same serializers
+with their loaded values, so references are written out as ids without
+being dereferenced.
+"""
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _id(value):
+    """String id of an ObjectId, DBRef or loaded document"""
+    return str(getattr(value, 'id', value)) if value is not None else None
+
+
+def _ticket_status(value):
+    return f'TicketStatus.{value}'
+
+
+EVENT_FIELDS = (
+    ('id', '_id', _id),
+    ('title', 'title', None),
+    ('description', 'description', None),
+    ('category', 'category', None),
+    ('location', 'location', None),
+    ('date', 'date', _iso),
+    ('price', 'price', None),
+    ('imageUrl', 'image_url', None),
+    ('availableTickets', 'available_tickets', None),
+    ('organizerName', 'organizer_name', None),
+    ('organizerId', 'organizer_id', _id),
+)
+
+TICKET_FIELDS = (
+    ('id', '_id', _id),
+    ('eventId', 'event_id', _id),
+    ('eventTitle', 'event_title', None),
+    ('eventLocation', 'event_location', None),
+    ('eventDate', 'event_date', _iso),
+    ('userId', 'user_id', _id),
+    ('status', 'status', _ticket_status),
+    ('purchaseDate', 'purchase_date', _iso),
+    ('price', 'price', None),
+    ('qrCode', 'qr_code', None),
+    ('seatNumber', 'seat_number', None),
+    ('expiresAt', 'expires_at', _iso),
+)
+
+USER_FIELDS = (
+    ('id', '_id', _id),
+    ('email', 'email', None),
+    ('name', 'name', None),
+    ('phone', 'phone', None),
+    ('role', 'role', None),
+    ('createdAt', 'created_at', _iso),
+)
+
+
+def stored_fields(fields):
+    """Model field names a field map reads, for only() projections"""
+    return [source.lstrip('_') for _, source, _ in fields]
+
+
+def serializer(fields):
+    """Build a function turning a raw document into its API dict"""
+    fields = tuple(fields)
+
+    def serialize(doc):
+        get = doc.get
+        return {key: convert(get(source)) if convert else get(source) for key, source, convert in fields}
+    return serialize
+
+
+event_dict = serializer(EVENT_FIELDS)
+ticket_dict = serializer(TICKET_FIELDS)
+user_dict = serializer(USER_FIELDS)
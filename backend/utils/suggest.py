@@ -0,0 +1,141 @@
+"""In-memory prefix index for event title and location autocomplete
+
+The index is built at startup and updated incrementally through Event
+save/delete signals, so lookups never touch MongoDB. Writes made by other
+workers are picked up by a background thread, which rebuilds the index
+when the shared 'events' version moved and swaps it in.
+"""
+import bisect
+import threading
+from mongoengine import signals
+from models import Event
+from utils.search import tokenize
+from utils.versions import watch
+
+
+class PrefixIndex:
+    """Sorted list of normalized keys supporting prefix lookups by bisection.
+
+    Every word position of a title or location is indexed, so 'fest' finds
+    'Summer Music Festival'. Locations shared by several events are stored
+    once with a reference count.
+    """
+
+    def __init__(self):
+        self._keys = []  # sorted (key, kind, text)
+        self._refs = {}  # (key, kind, text) -> number of events using it
+        self._entries = {}  # event id -> entries it contributed
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entries_for(title, location):
+        entries = set()
+        for kind, text in (('title', title), ('location', location)):
+            if not text:
+                continue
+            words = tokenize(text)
+            for i in range(len(words)):
+                entries.add((' '.join(words[i:]), kind, text))
+        return entries
+
+    @classmethod
+    def build(cls, events):
+        """Return an index of (event id, title, location) rows, sorted once"""
+        built = cls()
+        for event_id, title, location in events:
+            entries = cls._entries_for(title, location)
+            built._entries[event_id] = entries
+            for entry in entries:
+                built._refs[entry] = built._refs.get(entry, 0) + 1
+        built._keys = sorted(built._refs)
+        return built
+
+    def add(self, event_id, title, location):
+        """Index (or re-index) an event"""
+        entries = self._entries_for(title, location)
+        with self._lock:
+            self._discard(event_id)
+            for entry in entries:
+                count = self._refs.get(entry, 0)
+                if not count:
+                    bisect.insort(self._keys, entry)
+                self._refs[entry] = count + 1
+            self._entries[event_id] = entries
+
+    def remove(self, event_id):
+        """Drop an event from the index"""
+        with self._lock:
+            self._discard(event_id)
+
+    def _discard(self, event_id):
+        for entry in self._entries.pop(event_id, ()):
+            count = self._refs[entry] - 1
+            if count:
+                self._refs[entry] = count
+            else:
+                del self._refs[entry]
+                del self._keys[bisect.bisect_left(self._keys, entry)]
+
+    def replace(self, other):
+        """Take over the contents of `other`, e.g. a freshly built index"""
+        with self._lock:
+            self._keys, self._refs, self._entries = other._keys, other._refs, other._entries
+
+    def suggest(self, prefix, limit=10):
+        """Return up to `limit` distinct {'text', 'type'} matches for `prefix`"""
+        prefix = ' '.join(tokenize(prefix))
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(results) < limit:
+                key, kind, text = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                if (kind, text) not in seen:
+                    seen.add((kind, text))
+                    results.append({'text': text, 'type': kind})
+                position += 1
+        return results
+
+    def __len__(self):
+        return len(self._entries)
+
+
+index = PrefixIndex()
+
+
+def build_index():
+    """Rebuild the prefix index from every event in the database"""
+    index.replace(PrefixIndex.build(
+        (doc['_id'], doc.get('title'), doc.get('location'))
+        for doc in Event.objects.only('title', 'location').as_pymongo()
+    ))
+
+
+def _on_event_saved(sender, document, **kwargs):
+    index.add(document.id, document.title, document.location)
+
+
+def _on_event_deleted(sender, document, **kwargs):
+    index.remove(document.id)
+
+
+def init_suggest(refresh_interval=5):
+    """Build the prefix index and keep it in sync with event writes.
+
+    Every `refresh_interval` seconds a background thread checks the 'events'
+    version and rebuilds on change; 0 relies on this worker's signals only.
+    """
+    if refresh_interval:
+        watch('events', refresh_interval, build_index, name='suggest-refresh')
+    try:
+        build_index()
+        print(f"🔎 Suggest index ready ({len(index)} events)")
+    except Exception as e:
+        print(f"⚠️ Could not build suggest index: {e}")
+    signals.post_save.connect(_on_event_saved, sender=Event)
+    signals.post_delete.connect(_on_event_deleted, sender=Event)
@@ -0,0 +1,72 @@
+"""Atomic ticket status transitions"""
+from mongoengine import Q
+from models import Ticket
+from utils.versions import bump, organizer_keys, ticket_keys
+from utils.sales_counters import after_write, organizer_of, record_transition
+
+# Allowed status changes: current status -> statuses it may move to.
+# Holds never become 'expired': an abandoned hold is deleted and its seat
+# released (utils.reservations), which a status change would skip.
+TRANSITIONS = {
+    'pending': {'active'},
+    'active': {'used', 'expired'},
+    'used': set(),
+    'expired': set(),
+}
+
+
+class TransitionError(Exception):
+    """Raised when a ticket cannot move to the requested status.
+
+    `ticket` holds the ticket's current state when it exists, so callers
+    can build a detailed response without querying again.
+    """
+
+    def __init__(self, message, status_code=400, ticket=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.ticket = ticket
+
+
+def transition(ticket_id, to_status, user_id=None, condition=None,
+               condition_error='Ticket cannot be updated', **updates):
+    """Move a ticket to `to_status` with a conditional find-and-modify.
+
+    The current status (and owner and `condition`, a Q object, when given)
+    are part of the update filter, so two concurrent callers can never both
+    perform the same transition. Extra modify arguments such as
+    set__used_at=... are applied in the same update. Returns the updated
+    ticket or raises TransitionError.
+    """
+    from_statuses = [status for status, targets in TRANSITIONS.items() if to_status in targets]
+    if not from_statuses:
+        raise TransitionError(f'Cannot change ticket status to {to_status}')
+
+    query = Q(id=ticket_id)
+    if user_id is not None:
+        query &= Q(user_id=user_id)
+    if condition is not None:
+        query &= condition
+
+    # One attempt per source status, so the sales counters know which one applied
+    for from_status in sorted(from_statuses):
+        ticket = Ticket.objects(query & Q(status=from_status)).modify(set__status=to_status, new=True, **updates)
+        if ticket:
+            after_write(
+                lambda: bump(*ticket_keys(ticket.ref_id('user_id')), *organizer_keys(organizer_of(ticket.ref_id('event_id')))),
+                lambda: record_transition(ticket, from_status, to_status)
+            )
+            return ticket
+
+    # Slow path: the update matched nothing, find out why
+    ticket = Ticket.objects(id=ticket_id).first()
+    if not ticket:
+        raise TransitionError('Ticket not found', 404)
+    if user_id is not None and str(ticket.user_id.id) != str(user_id):
+        raise TransitionError('Unauthorized', 403, ticket)
+    if ticket.status not in from_statuses:
+        if len(from_statuses) == 1:
+            raise TransitionError(f'Ticket is not {from_statuses[0]}', 400, ticket)
+        raise TransitionError(f'Cannot change ticket from {ticket.status} to {to_status}', 400, ticket)
+    raise TransitionError(condition_error, 400, ticket)
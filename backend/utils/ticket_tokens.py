@@ -0,0 +1,50 @@
+"""Compact signed ticket tokens embedded in QR codes"""
+import base64
+import hashlib
+import hmac
+import os
+from bson import ObjectId
+from bson.errors import InvalidId
+
+SIGNATURE_BYTES = 10
+DIGEST_LENGTH = 16  # hex chars, 64 bits of SHA-256
+
+_key = os.getenv('TICKET_SIGNING_KEY', 'ticket-signing-key-change-this-in-production').encode()
+
+
+def configure(key):
+    """Set the secret used to sign ticket tokens"""
+    global _key
+    _key = key.encode() if isinstance(key, str) else key
+
+
+def _sign(payload):
+    return hmac.new(_key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def issue_token(ticket_id, event_id):
+    """Return a URL-safe token identifying a ticket and its event"""
+    payload = ObjectId(ticket_id).binary + ObjectId(event_id).binary
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b'=').decode()
+
+
+def parse_token(token):
+    """Return (ticket_id, event_id) for a genuine token, or None"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return None
+
+    payload, signature = raw[:-SIGNATURE_BYTES], raw[-SIGNATURE_BYTES:]
+    if len(payload) != 24 or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    try:
+        return ObjectId(payload[:12]), ObjectId(payload[12:])
+    except InvalidId:
+        return None
+
+
+def qr_digest(qr_data):
+    """Return the short fixed-length digest used to index a ticket's QR data"""
+    return hashlib.sha256(qr_data.encode()).hexdigest()[:DIGEST_LENGTH]
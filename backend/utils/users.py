@@ -0,0 +1,94 @@
+"""User resolution with a per-request memo and a short-TTL process cache
+
+Raw user documents are cached per process by id; every lookup returns a
+fresh User built from the cached document, so handlers may modify and
+save it without affecting other requests. Within one request the same
+instance is returned each time.
+
+Writes through update_profile, change_password and delete_account
+invalidate the entry immediately in this process. Other processes see
+the change once their entry expires (USER_CACHE_TTL).
+
+Token revocation checks run on every authenticated request, so they read
+only the `token_version` field, through a separate small cache
+(TOKEN_VERSION_CACHE_TTL) that bounds how long a revoked token keeps
+working in other processes.
+"""
+from bson import ObjectId
+from flask import g, has_request_context
+from models import User
+from utils.cache import TTLCache
+
+_cache = TTLCache(maxsize=10000, ttl=30)
+_versions = TTLCache(maxsize=10000, ttl=30)
+
+
+def configure(cache_size=10000, ttl=30, version_ttl=30):
+    """Resize the process caches; a ttl of 0 disables the matching cache"""
+    global _cache, _versions
+    _cache = TTLCache(maxsize=cache_size, ttl=ttl)
+    _versions = TTLCache(maxsize=cache_size, ttl=version_ttl)
+
+
+def _memo():
+    """Per-request {user id: User or None} memo, or None outside a request"""
+    if not has_request_context():
+        return None
+    if 'users' not in g:
+        g.users = {}
+    return g.users
+
+
+def resolve_user(user_id, fresh=False):
+    """Return the User with `user_id` (a str or ObjectId), or None.
+
+    `fresh` skips the process cache and re-reads the database, for
+    password checks that must not act on a stale hash.
+    """
+    key = str(user_id)
+    memo = _memo()
+    if not fresh and memo is not None and key in memo:
+        return memo[key]
+
+    doc = None if fresh or not _cache.ttl else _cache.get(key)
+    if doc is None:
+        doc = User.objects(id=user_id).as_pymongo().first()
+        if doc is not None and _cache.ttl:
+            _cache.set(key, doc)
+
+    user = User._from_son(doc) if doc is not None else None
+    if memo is not None:
+        memo[key] = user
+    return user
+
+
+def token_version(user_id):
+    """Current token version of a user, or None if the user no longer exists.
+
+    Reads the one field, never the whole user document.
+    """
+    key = str(user_id)
+    version = _versions.get(key) if _versions.ttl else None
+    if version is None:
+        doc = User._get_collection().find_one({'_id': ObjectId(user_id)}, {'token_version': 1})
+        if doc is None:
+            return None
+        version = doc.get('token_version') or 0
+        if _versions.ttl:
+            _versions.set(key, version)
+    return version
+
+
+def invalidate_user(user_id):
+    """Drop a user from the process caches and the current request's memo"""
+    key = str(user_id)
+    _cache.delete(key)
+    _versions.delete(key)
+    memo = _memo()
+    if memo is not None:
+        memo.pop(key, None)
+
+
+def stats():
+    """Process cache hit/miss counters"""
+    return {'hits': _cache.hits, 'misses': _cache.misses, 'size': len(_cache)}
@@ -0,0 +1,147 @@
+"""Resource version counters and ETag-based conditional GETs
+
+Write paths bump the counters of whatever they changed (always after the
+write itself); read endpoints derive their ETag from the counters they
+depend on. Counters live in MongoDB so every worker sees the same values.
+
+Keys in use:
+  events              - any event was created, edited or deleted
+  event:<id>          - one event changed, including its inventory
+  organizer:<id>      - an organizer's events or ticket sales changed
+  tickets:user:<id>   - one user's tickets changed
+
+Ticket writes never touch a key shared by every event, so concurrent
+sales of different events do not contend on one counter document. The
+public event list therefore picks up inventory changes through its
+time window rather than through the 'events' counter.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+from flask import request, make_response, g
+from flask_jwt_extended import get_jwt_identity
+from mongoengine import signals
+from pymongo import UpdateOne
+from models import Event, ResourceVersion
+from utils.response_cache import normalized_args
+
+
+def event_keys(event_id):
+    """Counters touched by a change to one event's fields"""
+    return ('events', f'event:{event_id}')
+
+
+def inventory_keys(event_id):
+    """Counters touched by a change to one event's available tickets"""
+    return (f'event:{event_id}',)
+
+
+def organizer_keys(*organizer_ids):
+    """Counters touched by a change to the stats of `organizer_ids`"""
+    return tuple(f'organizer:{organizer_id}' for organizer_id in organizer_ids if organizer_id is not None)
+
+
+def ticket_keys(*user_ids):
+    """Counters touched by a change to tickets owned by `user_ids`"""
+    return tuple(f'tickets:user:{user_id}' for user_id in user_ids)
+
+
+def bump(*keys):
+    """Increment the counters for `keys` in one round trip"""
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    ResourceVersion._get_collection().bulk_write(
+        [UpdateOne({'_id': key}, {'$inc': {'version': 1}}, upsert=True) for key in keys],
+        ordered=False
+    )
+
+
+def current(keys):
+    """Return {key: version} for `keys`; counters never bumped read as 0"""
+    found = {
+        doc['_id']: doc['version']
+        for doc in ResourceVersion._get_collection().find({'_id': {'$in': list(keys)}})
+    }
+    return {key: found.get(key, 0) for key in keys}
+
+
+def watch(key, interval, on_change, name='version-watch'):
+    """Call on_change() on a daemon thread whenever counter `key` moves.
+
+    Lets per-process state derived from the database (e.g. search indexes)
+    pick up writes made by other workers, whose signals never reach it.
+    The counter is first read before this returns, so start the watch
+    before building that state; each change is read before on_change()
+    runs, so a write racing with it triggers another call. Polls every
+    `interval` seconds and returns a threading.Event that stops it.
+    """
+    stop = threading.Event()
+    try:
+        seen = current([key])[key]
+    except Exception:
+        seen = None
+
+    def poll():
+        nonlocal seen
+        while not stop.wait(interval):
+            try:
+                version = current([key])[key]
+                if seen is not None and version != seen:
+                    on_change()
+                seen = version
+            except Exception as e:
+                print(f"⚠️ Could not refresh after a change to '{key}': {e}")
+
+    thread = threading.Thread(target=poll, name=name, daemon=True)
+    thread.start()
+    return stop
+
+
+def conditional(keys_fn, private=False, window=None):
+    """Answer If-None-Match with 304 while none of keys_fn(**view_args) changed.
+
+    The ETag covers the path, the query args and the counter values, plus
+    the caller's identity when `private`. Counters are read before the view
+    runs, so a concurrent write can only make an ETag stale (a wasted 200
+    later), never produce a 304 for changed data. Views whose output also
+    depends on the clock (e.g. upcoming-only filters) pass `window` so
+    their ETag rolls over every `window` seconds. The versions are left on
+    `g` so that @cached only serves bodies rendered under them.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            versions = current(keys_fn(**request.view_args))
+            g.resource_versions = versions  # cached bodies must match these
+            parts = [request.path, normalized_args(), sorted(versions.items())]
+            if private:
+                parts.append(get_jwt_identity())
+            if window:
+                parts.append(int(time.time() // window))
+            etag = hashlib.sha1(repr(parts).encode()).hexdigest()
+            cache_control = 'private, no-cache' if private else 'no-cache'
+
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
+
+
+def _on_event_changed(sender, document, **kwargs):
+    bump(*event_keys(document.id), *organizer_keys(document.ref_id('organizer_id')))
+
+
+def init_versions():
+    """Keep event counters in sync with event saves and deletes"""
+    signals.post_save.connect(_on_event_changed, sender=Event)
+    signals.post_delete.connect(_on_event_changed, sender=Event)
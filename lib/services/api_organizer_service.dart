@@ -173,21 +173,37 @@ class ApiOrganizerService extends GetxService {
     }
   }
 
-  /// Get event attendees
+  /// Get event attendees, following next_cursor until every page is loaded
   Future<Map<String, dynamic>> getEventAttendees(String eventId) async {
     try {
       print('🌐 Fetching attendees for event: $eventId');
-      final response = await _api.get('/organizer/events/$eventId/attendees');
-
-      if (response.statusCode == 200) {
-        print('✅ Loaded ${response.data['total']} attendees');
-        return {
-          'success': true,
-          'event': response.data['event'],
-          'attendees': response.data['attendees'] as List<dynamic>,
-          'total': response.data['total'],
-        };
-      }
+      final attendees = <dynamic>[];
+      String? cursor;
+
+      do {
+        final response = await _api.get(
+          '/organizer/events/$eventId/attendees',
+          queryParameters: {
+            'per_page': 100,
+            if (cursor != null) 'cursor': cursor,
+          },
+        );
+
+        if (response.statusCode != 200) break;
+
+        attendees.addAll(response.data['attendees'] as List<dynamic>);
+        cursor = response.data['next_cursor'];
+
+        if (cursor == null) {
+          print('✅ Loaded ${attendees.length} attendees');
+          return {
+            'success': true,
+            'event': response.data['event'],
+            'attendees': attendees,
+            'total': attendees.length,
+          };
+        }
+      } while (true);
 
       return {
         'success': false,
@@ -63,6 +63,10 @@ class ApiUserService extends GetxService {
       );
 
       if (response.statusCode == 200) {
+        // Tokens issued before the change are revoked
+        if (response.data['access_token'] != null) {
+          _api.saveToken(response.data['access_token']);
+        }
         return {'success': true, 'message': response.data['message']};
       }
 